@@ -21,25 +21,34 @@ def endBalance():
 	balance = float(input("Enter the outstanding balance on your credit card:"))
 	rate = float(input("Enter the annual credit card interest rate as a decimal:"))
 	payment = float(input("Enter the minimum monthly payment rate as a decimal:"))
+	total, balance = calcEndBalance(balance, rate, payment, verbose=True)
+
+	print("RESULT")
+	print("Total amount paid: $%.2f" %(total))
+	print("Remaining balance: $%.2f" %(balance))
+
+def calcEndBalance(balance, rate, payment, months=12, verbose=False):
+	"""
+	Calculates the total paid and remaining balance after months months of
+	paying only the minimum monthly payment. Prints each month if verbose.
+	Returns a tuple (total amount paid, remaining balance).
+	"""
 	total = 0
 	
-	for i in range(1, 13):
+	for i in range(1, months + 1):
 		min_payment = payment * balance
-		interest = rate/12 * balance
+		interest = rate/12.0 * balance
 		principal = min_payment - interest
 		total = total + min_payment
 		balance = balance - principal
 
-		print("Month " + str(i))
-		print("Minimum monthly payment: $%.2f" %(min_payment))
-		print("Principal Paid: $%.2f" %(principal))
-		print("Remaining balnce: $%.2f" %(balance))
-		
-	print("RESULT")
-	print("Total amount paid: $%.2f" %(total))
-	print("Remaining balance: $%.2f" %(balance))
-	
-endBalance()
+		if verbose:
+			print("Month " + str(i))
+			print("Minimum monthly payment: $%.2f" %(min_payment))
+			print("Principal Paid: $%.2f" %(principal))
+			print("Remaining balnce: $%.2f" %(balance))
+
+	return (total, balance)
 
 # Problem 2. Write a program that calculates the minimum fixed monthly payment needed
 # in order pay off a credit card balance within 12 months. We will not be dealing
@@ -56,14 +65,36 @@ def minPayment1():
 	"""
 	balance = float(input("Enter the outstanding balance on your credit card:"))
 	rate = float(input("Enter the annual credit card interest rate as a decimal:"))
-	monthly_rate = rate / 12
+	payment, month, test_balance = calcMinPayment1(balance, rate)
+
+	print("RESULT")
+	print("Monthly payment to pay off debt in 1 year:$%.2f" % (payment))
+	print("Number of months needed: " + str(month))
+	print("Balance: %.2f" % (test_balance))
+
+def calcMinPayment1(balance, rate, verbose=False, search='linear'):
+	"""
+	Finds the minimum monthly payment, in multiples of $10, that pays off balance
+	within 12 months. Prints each payment tried if verbose.
+	Returns a tuple (monthly payment, number of months needed, balance).
+
+	With search='bracket', finds the exact minimum payment to the cent instead,
+	using bracketPayment.
+	"""
+	monthly_rate = rate / 12.0
+	if search == 'bracket':
+		payment = bracketPayment(balance, monthly_rate, 12)
+		month, test_balance = payOff(balance, monthly_rate, payment, 12)
+		return (payment, month, test_balance)
+
 	payment = 0
 	test_balance = balance
 
 	while test_balance > 0:
 		test_balance = balance
 		payment += 10
-		#print("Payment: $%.2f" % (payment))
+		if verbose:
+			print("Payment: $%.2f" % (payment))
 
 		for month in range(1, 13):
 
@@ -78,12 +109,7 @@ def minPayment1():
 			if test_balance <= 0:
 				break
 
-	print("RESULT")
-	print("Monthly payment to pay off debt in 1 year:$%.2f" % (payment))
-	print("Number of months needed: " + str(month))
-	print("Balance: %.2f" % (test_balance))
-
-minPayment1()
+	return (payment, month, test_balance)
 
 # Problem 3. Write a program that calculates the minimum fixed monthly payment needed
 # in order pay off a credit card balance within 12 months. We will not be dealing with
@@ -102,10 +128,23 @@ def minPayment2():
 	
 	balance = float(input("Enter the outstanding balance on your credit card:"))
 	rate = float(input("Enter the annual credit card interest rate as a decimal:"))
-	monthly_rate = rate/12
+	payment, month, test_balance = calcMinPayment2(balance, rate, verbose=True)
+
+	print("RESULT")
+	print("Monthly payment to pay off debt in 1 year:$%.2f" %(payment))
+	print("Number of months needed: " + str(month))
+	print("Balance: %.2f" %(test_balance))
+
+def calcMinPayment2(balance, rate, verbose=False):
+	"""
+	Finds the minimum monthly payment, to the cent, that pays off balance within
+	12 months using a bisection search. Prints every step of the search if verbose.
+	Returns a tuple (monthly payment, number of months needed, balance).
+	"""
+	monthly_rate = rate/12.0
 	
 	# Initialize starting values for variables
-	low_bound = balance/12
+	low_bound = balance/12.0
 	high_bound = (balance * (1 + monthly_rate)**12)/12
 	payment = round(((high_bound+low_bound)/2), 2)
 	test_balance = balance
@@ -113,17 +152,19 @@ def minPayment2():
 	# Loop until a solution is found with remaining balance <= 0
 	while True:
 		test_balance = balance
-		print("Payment: $%.2f" %(payment))
-		print("Low Bound: $%.2f" %(low_bound))
-		print("High Bound: $%.2f" %(high_bound))
+		if verbose:
+			print("Payment: $%.2f" %(payment))
+			print("Low Bound: $%.2f" %(low_bound))
+			print("High Bound: $%.2f" %(high_bound))
 
 		for month in range(1,13):
 			interest = round((monthly_rate * test_balance), 2)
 			principal = payment - interest
 			test_balance = test_balance - principal
-			print("    Month " + str(month))
-			print("        Principal Paid: $%.2f" %(principal))
-			print("        Remaining balnce: $%.2f" %(test_balance))
+			if verbose:
+				print("    Month " + str(month))
+				print("        Principal Paid: $%.2f" %(principal))
+				print("        Remaining balnce: $%.2f" %(test_balance))
 
 			# If remaining balance <= 0 before month 12, break
 			if test_balance <= 0:
@@ -131,11 +172,7 @@ def minPayment2():
 
 		# If solution is found, break, otherwise adjust bounds before next loop 
 		if (test_balance <= 0) and (payment - low_bound < 0.03):
-			print("RESULT")
-			print("Monthly payment to pay off debt in 1 year:$%.2f" %(payment))
-			print("Number of months needed: " + str(month))
-			print("Balance: %.2f" %(test_balance))
-			break
+			return (payment, month, test_balance)
 		elif test_balance > 0:
 			low_bound = payment
 			payment = round(((high_bound+payment)/2), 2)
@@ -143,4 +180,91 @@ def minPayment2():
 			high_bound = payment
 			payment = round(((low_bound+payment)/2), 2)
 
-minPayment2()
+# Problem 4. Calculate the minimum fixed monthly payment needed to pay off a credit card
+# balance within any number of months, without prompting or printing. The annuity formula
+# gives a starting guess, which is then corrected a cent at a time to match the interest
+# rounding used by minPayment1 and minPayment2.
+
+def payOff(balance, monthly_rate, payment, months):
+	"""
+	Pays a fixed monthly payment for up to months months, rounding interest to the
+	cent each month. Stops early if the balance is paid off.
+	Returns a tuple (months needed, remaining balance).
+	"""
+	test_balance = balance
+	month = 0
+	for month in range(1, months + 1):
+		interest = round((monthly_rate * test_balance), 2)
+		principal = payment - interest
+		test_balance = test_balance - principal
+		if test_balance <= 0:
+			break
+	return (month, test_balance)
+
+def fixedPayment(balance, rate, months=12):
+	"""
+	Returns a tuple (monthly payment, number of months needed, balance) for the
+	smallest payment, to the cent, that pays off balance within months months.
+
+	Test Case 1, use fixedPayment(320000, 0.2)
+	RESULT: (29643.05, 12, -0.1)
+
+	Test Case 2, use fixedPayment(999999, 0.18)
+	RESULT: (91679.91, 12, -0.13)
+	"""
+	monthly_rate = rate / 12.0
+
+	# Annuity payment for the horizon, rounded up to the cent
+	if monthly_rate == 0:
+		guess = float(balance) / months
+	else:
+		guess = balance * monthly_rate / (1 - (1 + monthly_rate)**-months)
+	cents = int(math.ceil(guess * 100))
+
+	# Rounding interest each month can move the answer a few cents either way
+	while payOff(balance, monthly_rate, cents / 100.0, months)[1] > 0:
+		cents += 1
+	while cents > 0 and payOff(balance, monthly_rate, (cents - 1) / 100.0, months)[1] <= 0:
+		cents -= 1
+
+	payment = cents / 100.0
+	month, test_balance = payOff(balance, monthly_rate, payment, months)
+	return (payment, month, round(test_balance, 2))
+
+# Problem 5. Find the minimum fixed monthly payment to the cent with a number of
+# simulations that grows with the number of digits in the balance rather than the
+# balance itself. Payments are counted in whole cents: the upper bound doubles until
+# it pays off the balance, then a bisection search closes in on the exact minimum.
+
+def bracketPayment(balance, monthly_rate, months=12):
+	"""
+	Returns the smallest payment, to the cent, that pays off balance within
+	months months at the given monthly interest rate.
+
+	Test Case 1, use bracketPayment(1200, 0.18/12)
+	RESULT: 110.02
+
+	Test Case 2, use bracketPayment(10000000, 0.2/12)
+	RESULT: 926345.06
+	"""
+	# low_cents never pays off the balance, high_cents always does
+	low_cents = 0
+	high_cents = 1
+	if payOff(balance, monthly_rate, 0, months)[1] <= 0:
+		return 0.0
+	while payOff(balance, monthly_rate, high_cents / 100.0, months)[1] > 0:
+		low_cents = high_cents
+		high_cents *= 2
+
+	while high_cents - low_cents > 1:
+		cents = (low_cents + high_cents) // 2
+		if payOff(balance, monthly_rate, cents / 100.0, months)[1] > 0:
+			low_cents = cents
+		else:
+			high_cents = cents
+	return high_cents / 100.0
+
+if __name__ == '__main__':
+	endBalance()
+	minPayment1()
+	minPayment2()
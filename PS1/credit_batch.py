@@ -0,0 +1,99 @@
+# Problem Set 1: Batch credit card calculations
+#
+# Runs one of the calculators in credit.py over every account in a CSV file
+# without prompting or printing month by month. Rows are read one at a time and
+# results are written out in chunks, so large files never sit in memory.
+#
+# Input columns:
+#   balance, rate            all calculators
+#   payment                  endBalance (minimum monthly payment rate)
+#   months                   fixedPayment (optional, defaults to 12)
+#
+# Example:
+#   python credit_batch.py minPayment2 accounts.csv -o results.csv
+
+import argparse
+import csv
+import sys
+
+from credit import calcEndBalance, calcMinPayment1, calcMinPayment2, fixedPayment
+
+CHUNK_SIZE = 10000
+
+def runEndBalance(row):
+	total, balance = calcEndBalance(float(row['balance']), float(row['rate']),
+		float(row['payment']))
+	return ['%.2f' % total, '%.2f' % balance]
+
+def runMinPayment1(row):
+	payment, month, balance = calcMinPayment1(float(row['balance']), float(row['rate']))
+	return ['%.2f' % payment, month, '%.2f' % balance]
+
+def runMinPayment2(row):
+	payment, month, balance = calcMinPayment2(float(row['balance']), float(row['rate']))
+	return ['%.2f' % payment, month, '%.2f' % balance]
+
+def runFixedPayment(row):
+	months = int(row.get('months') or 12)
+	payment, month, balance = fixedPayment(float(row['balance']), float(row['rate']), months)
+	return ['%.2f' % payment, month, '%.2f' % balance]
+
+# calculator name -> (function applied to each row, result column names)
+CALCULATORS = {
+	'endBalance': (runEndBalance, ['total_paid', 'remaining_balance']),
+	'minPayment1': (runMinPayment1, ['monthly_payment', 'months_needed', 'balance_left']),
+	'minPayment2': (runMinPayment2, ['monthly_payment', 'months_needed', 'balance_left']),
+	'fixedPayment': (runFixedPayment, ['monthly_payment', 'months_needed', 'balance_left']),
+}
+
+def processAccounts(calculator, in_file, out_file, chunk_size=CHUNK_SIZE):
+	"""
+	Reads accounts from in_file, runs calculator on each one and writes the
+	input columns followed by the result columns to out_file, chunk_size rows
+	at a time. Returns the number of accounts processed.
+
+	calculator: string, one of the keys of CALCULATORS
+	in_file: open file with a header row
+	out_file: open file
+	"""
+	run, result_fields = CALCULATORS[calculator]
+	reader = csv.reader(in_file)
+	writer = csv.writer(out_file)
+	header = next(reader)
+	writer.writerow(header + result_fields)
+
+	count = 0
+	chunk = []
+	for values in reader:
+		chunk.append(values + run(dict(zip(header, values))))
+		if len(chunk) == chunk_size:
+			writer.writerows(chunk)
+			count += len(chunk)
+			chunk = []
+	writer.writerows(chunk)
+	count += len(chunk)
+	return count
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description='Run a credit card calculator over a CSV of accounts.')
+	parser.add_argument('calculator', choices=sorted(CALCULATORS))
+	parser.add_argument('accounts', nargs='?', default='-',
+		help='CSV file of accounts, or - for stdin (default)')
+	parser.add_argument('-o', '--output', default='-',
+		help='file to write results to, or - for stdout (default)')
+	parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE,
+		help='number of result rows written at a time')
+	args = parser.parse_args(argv)
+
+	in_file = sys.stdin if args.accounts == '-' else open(args.accounts, 'rb')
+	out_file = sys.stdout if args.output == '-' else open(args.output, 'wb')
+	try:
+		processAccounts(args.calculator, in_file, out_file, args.chunk_size)
+	finally:
+		if in_file is not sys.stdin:
+			in_file.close()
+		if out_file is not sys.stdout:
+			out_file.close()
+
+if __name__ == '__main__':
+	main()
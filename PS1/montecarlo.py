@@ -0,0 +1,91 @@
+# Problem Set 1: Variable interest rate simulation
+#
+# credit.py assumes the annual interest rate never changes. This module runs many
+# random interest rate paths for every account with a fixed monthly payment, and
+# summarizes how long the balance takes to pay off and what is left at the end.
+# Accounts are split into chunks that are simulated in a process pool. Each chunk
+# returns only percentiles, so memory stays bounded by the chunk size however large
+# the portfolio is.
+
+import multiprocessing
+
+import numpy as np
+
+from portfolio import roundCents
+
+def simulateChunk(task):
+	"""
+	Simulates paths random interest rate paths for a chunk of accounts.
+
+	Each month the annual rate of every path takes a random step with standard
+	deviation volatility, and never drops below 0. Interest is rounded to the cent
+	as in credit.py and the fixed payment is applied until the balance is paid off.
+
+	task: tuple (balances, rates, payments, months, paths, volatility, percentiles, seed)
+	returns: tuple (array of payoff month percentiles, array of balance percentiles),
+		both shape (len(balances), len(percentiles)). Paths that are not paid off
+		within months months count as months + 1, and balances that start at 0
+		or below count as 0.
+	"""
+	balances, rates, payments, months, paths, volatility, percentiles, seed = task
+	random = np.random.RandomState(seed)
+	balance = np.repeat(np.asarray(balances, dtype=float)[:, np.newaxis], paths, axis=1)
+	rate = np.repeat(np.asarray(rates, dtype=float)[:, np.newaxis], paths, axis=1)
+	payment = np.asarray(payments, dtype=float)[:, np.newaxis]
+	payoff_month = np.full(balance.shape, months + 1)
+	# Accounts with nothing to pay are paid off before the first month
+	payoff_month[balance <= 0] = 0
+
+	for month in range(1, months + 1):
+		active = balance > 0
+		if not active.any():
+			break
+		rate += volatility * random.standard_normal(rate.shape)
+		np.maximum(rate, 0, out=rate)
+		interest = roundCents(rate / 12 * balance)
+		balance = np.where(active, balance - (payment - interest), balance)
+		payoff_month[active & (balance <= 0)] = month
+
+	return (np.percentile(payoff_month, percentiles, axis=1).T,
+		np.percentile(balance, percentiles, axis=1).T)
+
+def monteCarlo(balances, rates, payments, months=12, paths=1000, volatility=0.01,
+		percentiles=(5, 50, 95), chunk_size=1000, processes=None, seed=0):
+	"""
+	Runs simulateChunk over a portfolio of accounts, chunk_size accounts at a
+	time, in a pool of processes worker processes (all CPUs if None, no pool
+	if 1). Results depend only on seed, not on the number of processes.
+
+	balances: array of outstanding balances
+	rates: array of starting annual interest rates as decimals
+	payments: array of fixed monthly payments
+	returns: tuple (array of payoff month percentiles, array of balance percentiles),
+		both shape (len(balances), len(percentiles))
+
+	Example:
+	>>> payoff, balance = monteCarlo([1200], [0.18], [110.02], paths=10000)
+	>>> payoff.tolist()
+	[[12.0, 13.0, 13.0]]
+	>>> monteCarlo([0], [0.1], [10], processes=1)[0].tolist()
+	[[0.0, 0.0, 0.0]]
+	"""
+	balances, rates, payments = np.broadcast_arrays(balances, rates, payments)
+	tasks = [(balances[i:i + chunk_size], rates[i:i + chunk_size], payments[i:i + chunk_size],
+			months, paths, volatility, percentiles, seed + i // chunk_size)
+		for i in range(0, len(balances), chunk_size)]
+
+	if processes == 1:
+		results = map(simulateChunk, tasks)
+	else:
+		pool = multiprocessing.Pool(processes)
+		try:
+			results = list(pool.imap(simulateChunk, tasks))
+		finally:
+			pool.close()
+			pool.join()
+
+	if not results:
+		empty = np.empty((0, len(percentiles)))
+		return (empty, empty.copy())
+	return (np.concatenate([r[0] for r in results]),
+		np.concatenate([r[1] for r in results]))
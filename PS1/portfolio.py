@@ -0,0 +1,143 @@
+# Problem Set 1: Portfolio calculations
+#
+# Batch versions of the credit card calculators in credit.py. Instead of one card
+# entered at the prompt, these take NumPy arrays describing many accounts and step
+# every account forward one month at a time using array operations.
+
+import hashlib
+import os
+import tempfile
+
+import numpy as np
+
+def endBalances(balances, rates, payment_rates, months=12):
+	"""
+	Calculates the total paid and remaining balance for every account after
+	months months of paying only the minimum monthly payment. Works the same way
+	as endBalance in credit.py, one array element per account.
+
+	balances: array of outstanding balances
+	rates: array of annual interest rates as decimals
+	payment_rates: array of minimum monthly payment rates as decimals
+	returns: tuple (array of total amounts paid, array of remaining balances)
+
+	Test Case, use endBalances([4800, 4800], [0.2, 0.2], [0.02, 0.04])
+	RESULT: Total amount paid: [1131.11, 2030.15]; Remaining balance: [4611.48, 3615.74]
+	"""
+	balances, rates, payment_rates = np.broadcast_arrays(balances, rates, payment_rates)
+	balance = np.array(balances, dtype=float)
+	# Paying payment_rate and charging monthly_rate both scale with the balance, so
+	# each month the balance is multiplied by the same factor
+	payment_rates = np.asarray(payment_rates, dtype=float)
+	factor = 1 - payment_rates + np.asarray(rates, dtype=float) / 12
+	total = np.zeros_like(balance)
+	payment = np.empty_like(balance)
+
+	for month in range(months):
+		np.multiply(payment_rates, balance, out=payment)
+		total += payment
+		balance *= factor
+
+	return (total, balance)
+
+def roundCents(amounts):
+	"""
+	Rounds an array of dollar amounts to the cent, with halves rounded away from
+	zero like round(amount, 2) in credit.py.
+	"""
+	cents = np.asarray(amounts, dtype=float) * 100
+	rounded = np.sign(cents) * np.floor(np.abs(cents) + 0.5) / 100
+	# Multiplying by 100 is not exact, so amounts within a hair of half a cent
+	# are rounded one at a time with round() to get the same answer
+	close = np.abs(np.abs(cents) % 1 - 0.5) < 1e-6
+	if close.any():
+		rounded[close] = [round(a, 2) for a in np.asarray(amounts, dtype=float)[close]]
+	return rounded
+
+def payOffs(balances, monthly_rates, payments, months):
+	"""
+	Vectorized payOff from credit.py. Pays a fixed monthly payment on every
+	account for up to months months, rounding interest to the cent, and stops
+	changing an account's balance once it is paid off.
+
+	balances, monthly_rates, payments, months: arrays that broadcast together
+	returns: array of remaining balances
+	"""
+	balances, monthly_rates, payments, months = np.broadcast_arrays(
+		balances, monthly_rates, payments, months)
+	balance = np.array(balances, dtype=float)
+	for month in range(int(months.max()) if months.size else 0):
+		active = (balance > 0) & (month < months)
+		if not active.any():
+			break
+		interest = roundCents(monthly_rates * balance)
+		balance = np.where(active, balance - (payments - interest), balance)
+	return balance
+
+def paymentGrid(balances, rates, horizons, cache_dir=None):
+	"""
+	Calculates the minimum fixed monthly payment, to the cent, for every
+	combination of balance, annual interest rate and payoff horizon in months.
+	Gives the same answer as fixedPayment in credit.py for each cell.
+
+	If cache_dir is given, the grid is saved there as a .npy file named after
+	its parameters and loaded from it on later calls with the same parameters.
+
+	balances: 1-D array of balances
+	rates: 1-D array of annual interest rates as decimals
+	horizons: 1-D array of months allowed to pay off the balance
+	returns: array of payments, shape (len(balances), len(rates), len(horizons))
+	"""
+	balances = np.asarray(balances, dtype=float)
+	rates = np.asarray(rates, dtype=float)
+	horizons = np.asarray(horizons, dtype=int)
+
+	if cache_dir is not None:
+		key = hashlib.sha1()
+		for a in (balances, rates, horizons):
+			key.update(str(a.shape))
+			key.update(np.ascontiguousarray(a).tostring())
+		cache_file = os.path.join(cache_dir, 'paymentGrid-%s.npy' % key.hexdigest())
+		if os.path.exists(cache_file):
+			return np.load(cache_file)
+
+	balance = balances[:, np.newaxis, np.newaxis]
+	monthly_rate = rates[np.newaxis, :, np.newaxis] / 12
+	months = horizons[np.newaxis, np.newaxis, :]
+
+	# Annuity payment for each cell, rounded up to the cent
+	growth = (1 + monthly_rate)**-months
+	with np.errstate(divide='ignore', invalid='ignore'):
+		guess = np.where(monthly_rate == 0, balance / months,
+			balance * monthly_rate / (1 - growth))
+	cents = np.ceil(guess * 100)
+	cents = np.maximum(cents, 0)
+
+	# Rounding interest each month can move the answer a few cents either way
+	while True:
+		short = payOffs(balance, monthly_rate, cents / 100, months) > 0
+		if not short.any():
+			break
+		cents[short] += 1
+	while True:
+		over = (cents > 0) & (payOffs(balance, monthly_rate, (cents - 1) / 100, months) <= 0)
+		if not over.any():
+			break
+		cents[over] -= 1
+
+	payments = cents / 100
+	if cache_dir is not None:
+		if not os.path.isdir(cache_dir):
+			os.makedirs(cache_dir)
+		# Write to a temporary file and rename it into place, so another process
+		# never loads a grid that is only partly written
+		fd, temp_file = tempfile.mkstemp(suffix='.tmp', dir=cache_dir)
+		f = os.fdopen(fd, 'wb')
+		try:
+			np.save(f, payments)
+		finally:
+			f.close()
+		# mkstemp makes the file readable only by its owner
+		os.chmod(temp_file, 0644)
+		os.rename(temp_file, cache_file)
+	return payments
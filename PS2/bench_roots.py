@@ -0,0 +1,54 @@
+# PS 2.1: Successive Approximation, benchmark
+#
+# Compares finding every root of x^d - 1 with compute_all_roots() against the
+# approach of calling compute_root() from d different starting points. The
+# polynomial has d complex roots but only two real ones, 1 and -1, so repeated
+# compute_root() calls spend most of their time converging to roots they have
+# already found.
+#
+# Usage: python bench_roots.py [degree ...]
+
+import sys
+import time
+
+import numpy as np
+
+from newton import Polynomial, compute_root
+from newton_batch import compute_all_roots
+
+DEGREES = (10, 50, 100, 250, 500)
+EPSILON = 1e-6
+
+def bench(degree):
+	"""
+	Returns a tuple (seconds for compute_all_roots, roots found, largest |f(root)|,
+	seconds for repeated compute_root, distinct roots found) for x^degree - 1.
+	"""
+	poly = Polynomial((-1.0,) + (0.0,) * (degree - 1) + (1.0,))
+
+	start = time.time()
+	roots = compute_all_roots(poly)
+	all_time = time.time() - start
+	residual = max(abs(poly(r)) for r in roots)
+
+	# Starting points just outside both real roots, where Newton's method is
+	# sure to converge (inside them the first step overshoots wildly)
+	x0s = np.concatenate((np.linspace(1.01, 1.1, degree // 2),
+		np.linspace(-1.1, -1.01, degree - degree // 2)))
+	start = time.time()
+	found = set()
+	for x_0 in x0s:
+		root, count = compute_root(poly, float(x_0), EPSILON)
+		found.add(round(root, 4))
+	repeat_time = time.time() - start
+
+	return (all_time, len(roots), residual, repeat_time, len(found))
+
+if __name__ == '__main__':
+	degrees = [int(d) for d in sys.argv[1:]] or DEGREES
+	print "%6s  %12s  %6s  %10s  %12s  %6s" % ('degree', 'all roots s', 'roots',
+		'max |f|', 'repeated s', 'roots')
+	for degree in degrees:
+		all_time, n_roots, residual, repeat_time, n_found = bench(degree)
+		print "%6d  %12.4f  %6d  %10.1e  %12.4f  %6d" % (degree, all_time, n_roots,
+			residual, repeat_time, n_found)
@@ -40,24 +40,13 @@ def choose_word(wordlist):
 # end of helper code
 # -----------------------------------
 
-# actually load the dictionary of words and point to it with 
-# the wordlist variable so that it can be accessed from anywhere
-# in the program
-
-wordlist = load_words()
-
 # your code begins here!
 
 def letters_left(letters_guessed):
 	"""
 	Returns a string of the letters that have not yet been guesses
 	"""
-	all_letters = string.ascii_lowercase
-	letters = ''
-	for l in all_letters:
-		if not l in letters_guessed:
-			letters += l
-	return letters
+	return ''.join([l for l in string.ascii_lowercase if not l in letters_guessed])
 
 def check_guess(word, g):
 	good_guess = False
@@ -74,13 +63,7 @@ def check_word(word, letters):
 	word is string of hidden word
 	letters is string of letters that have been guessed 
 	"""
-	out_word = ''
-	for w in word:
-		if w in letters:
-			out_word += w
-		else:
-			out_word += '_'
-	return out_word
+	return ''.join([w if w in letters else '_' for w in word])
 
 def hangman(wordlist, guesses):
 	"""
@@ -132,4 +115,10 @@ def hangman(wordlist, guesses):
 		print "Sorry, you are out of guesses"
 		print "The word was " + word
 
-hangman(wordlist, 8)
+if __name__ == '__main__':
+	# actually load the dictionary of words and point to it with 
+	# the wordlist variable so that it can be accessed from anywhere
+	# in the program
+	wordlist = load_words()
+	hangman(wordlist, 8)
+
@@ -0,0 +1,213 @@
+# PS 2.2 Hangman Game, network server
+#
+# Hosts many games of hangman in one process. Each connection plays one game at
+# a time over a simple line protocol. The word list is loaded once and shared,
+# and each game keeps only a small HangmanSession. Connections that stay idle
+# for too long are closed, so memory stays bounded.
+#
+# Python 2 has no asyncio, so the server is built on the standard library's
+# asyncore and asynchat event loop instead.
+#
+# Protocol (one command per line):
+#   new       start a new game    -> NEW <pattern> <guesses left>
+#   <letter>  guess a letter      -> GOOD|MISS|AGAIN <pattern> <guesses left>,
+#                                    then WIN <word> or LOSE <word> at the end
+#   quit      close the connection
+# Anything else gets ERROR <message>.
+#
+# Usage: python hangman_server.py [port]
+
+import asynchat
+import asyncore
+import errno
+import socket
+import string
+import sys
+import time
+
+import hangman
+
+GUESSES = 8
+IDLE_TIMEOUT = 300      # seconds before an idle connection is closed
+SWEEP_INTERVAL = 10     # seconds between checks for idle connections
+MAX_LINE = 1024         # longest command line accepted, in bytes
+ACCEPT_BACKOFF = 0.5    # seconds to stop accepting after running out of file descriptors
+
+# accept() errors that mean the process or system is out of resources for now
+ACCEPT_EXHAUSTED = (errno.EMFILE, errno.ENFILE, errno.ENOBUFS, errno.ENOMEM)
+
+LETTER_BITS = dict((l, 1 << i) for i, l in enumerate(string.ascii_lowercase))
+
+class HangmanSession(object):
+	"""
+	The state of one game: the secret word, a bitmask of the letters guessed
+	(bit i for the ith letter of the alphabet) and the wrong guesses left.
+
+	Example:
+	>>> session = HangmanSession('tall', 8)
+	>>> session.guess('l')
+	'GOOD'
+	>>> session.pattern(), session.guesses_left
+	('__ll', 8)
+	"""
+	__slots__ = ('word', 'word_mask', 'guessed', 'guesses_left')
+
+	def __init__(self, word, guesses):
+		self.word = word
+		self.word_mask = 0
+		for letter in word:
+			self.word_mask |= LETTER_BITS[letter]
+		self.guessed = 0
+		self.guesses_left = guesses
+
+	def guess(self, letter):
+		"""
+		Records a guess and returns 'AGAIN' if the letter was already guessed,
+		'GOOD' if it is in the word or 'MISS' if it is not.
+
+		letter: lowercase letter
+		"""
+		bit = LETTER_BITS[letter]
+		if self.guessed & bit:
+			return 'AGAIN'
+		self.guessed |= bit
+		if self.word_mask & bit:
+			return 'GOOD'
+		self.guesses_left -= 1
+		return 'MISS'
+
+	def pattern(self):
+		"""
+		Returns the word with letters not guessed yet shown as _.
+		"""
+		return ''.join([w if self.guessed & LETTER_BITS[w] else '_' for w in self.word])
+
+	def won(self):
+		return self.word_mask & self.guessed == self.word_mask
+
+	def over(self):
+		return self.won() or self.guesses_left <= 0
+
+class HangmanHandler(asynchat.async_chat):
+	"""
+	One client connection.
+	"""
+	def __init__(self, sock, server):
+		asynchat.async_chat.__init__(self, sock)
+		self.server = server
+		self.session = None
+		self.buffer = []
+		self.buffered = 0
+		# True while the rest of a line that was too long is being thrown away
+		self.discarding = False
+		self.last_active = time.time()
+		self.set_terminator('\n')
+
+	def collect_incoming_data(self, data):
+		if self.discarding:
+			return
+		self.buffer.append(data)
+		self.buffered += len(data)
+		if self.buffered > MAX_LINE:
+			self.buffer = []
+			self.buffered = 0
+			self.discarding = True
+			self.reply('ERROR line too long')
+
+	def found_terminator(self):
+		line = ''.join(self.buffer).strip().lower()
+		self.buffer = []
+		self.buffered = 0
+		self.last_active = time.time()
+		if self.discarding:
+			# End of the line that was too long, already answered
+			self.discarding = False
+			return
+
+		if line == 'quit':
+			self.close_when_done()
+		elif line == 'new':
+			self.session = HangmanSession(hangman.choose_word(self.server.wordlist),
+				self.server.guesses)
+			self.reply('NEW %s %d' % (self.session.pattern(), self.session.guesses_left))
+		elif len(line) == 1 and line in LETTER_BITS:
+			if self.session is None:
+				self.reply('ERROR no game, send new')
+				return
+			result = self.session.guess(line)
+			self.reply('%s %s %d' % (result, self.session.pattern(), self.session.guesses_left))
+			if self.session.won():
+				self.reply('WIN ' + self.session.word)
+				self.session = None
+			elif self.session.over():
+				self.reply('LOSE ' + self.session.word)
+				self.session = None
+		else:
+			self.reply('ERROR expected new, quit or a letter')
+
+	def reply(self, line):
+		self.push(line + '\n')
+
+	def handle_close(self):
+		self.server.handlers.discard(self)
+		self.close()
+
+class HangmanServer(asyncore.dispatcher):
+	"""
+	Listens for connections and keeps track of the open ones so that idle
+	connections can be closed.
+	"""
+	def __init__(self, wordlist, port, host='', guesses=GUESSES):
+		asyncore.dispatcher.__init__(self)
+		self.wordlist = wordlist
+		self.guesses = guesses
+		self.handlers = set()
+		self.resume_accept = 0
+		self.create_socket(socket.AF_INET, socket.SOCK_STREAM)
+		self.set_reuse_addr()
+		self.bind((host, port))
+		self.listen(128)
+
+	def readable(self):
+		return time.time() >= self.resume_accept
+
+	def handle_accept(self):
+		try:
+			pair = self.accept()
+		except socket.error as e:
+			if e.args[0] not in ACCEPT_EXHAUSTED:
+				raise
+			# Leave the connection waiting in the backlog, and stop polling the
+			# listening socket for a moment instead of spinning on it
+			self.resume_accept = time.time() + ACCEPT_BACKOFF
+			return
+		if pair is not None:
+			self.handlers.add(HangmanHandler(pair[0], self))
+
+	def evict_idle(self, timeout=IDLE_TIMEOUT):
+		"""
+		Closes every connection that has not sent a line for timeout seconds.
+		Returns the number closed.
+		"""
+		cutoff = time.time() - timeout
+		idle = [h for h in self.handlers if h.last_active < cutoff]
+		for handler in idle:
+			handler.reply('ERROR idle timeout')
+			handler.close_when_done()
+			self.handlers.discard(handler)
+		return len(idle)
+
+	def serve_forever(self):
+		next_sweep = time.time() + SWEEP_INTERVAL
+		while True:
+			# poll() has no limit on descriptor numbers, unlike select()
+			asyncore.loop(timeout=ACCEPT_BACKOFF, use_poll=True, count=1)
+			if time.time() >= next_sweep:
+				self.evict_idle()
+				next_sweep = time.time() + SWEEP_INTERVAL
+
+if __name__ == '__main__':
+	port = int(sys.argv[1]) if len(sys.argv) > 1 else 8600
+	server = HangmanServer(hangman.load_words(), port)
+	print "Serving hangman on port", port
+	server.serve_forever()
@@ -0,0 +1,148 @@
+# PS 2.2 Hangman Game, strategy tournament
+#
+# Plays every word in a word list as the secret word with one or more guessing
+# strategies and records whether each game was won, how many letters were
+# guessed and how many of them were wrong. Words are split into chunks that are
+# played in a process pool, and the results are saved as NumPy arrays.
+#
+# Usage: python hangman_sim.py words.txt -s informative english -o results.npz
+
+import argparse
+import multiprocessing
+import time
+
+import numpy as np
+
+import hangman
+from hangman_solver import HangmanSolver, WordIndex, solve
+
+ENGLISH_ORDER = 'etaoinshrdlcumwfgypbvkjxqz'
+
+def guess_alphabetical(solver):
+	"""
+	Guesses the first letter of the alphabet not guessed yet.
+	"""
+	for letter in 'abcdefghijklmnopqrstuvwxyz':
+		if not letter in solver.guessed:
+			return letter
+
+def guess_english(solver):
+	"""
+	Guesses letters in order of how common they are in English text, ignoring
+	the candidate words.
+	"""
+	for letter in ENGLISH_ORDER:
+		if not letter in solver.guessed:
+			return letter
+
+def guess_split(solver):
+	"""
+	Guesses the letter that splits the candidate words most evenly between
+	words that contain it and words that don't. Letters in no candidate are
+	certain misses and are never guessed while another letter is left, and
+	ties go to the letter in more candidates.
+	"""
+	counts = solver.letter_counts()
+	letters = [letter for letter in sorted(counts) if counts[letter] > 0]
+	if not letters:
+		# The secret word is not in the word list
+		return guess_english(solver)
+	return min(letters, key=lambda letter: (abs(2 * counts[letter] - solver.count), -counts[letter]))
+
+STRATEGIES = {
+	'informative': HangmanSolver.best_letter,
+	'alphabetical': guess_alphabetical,
+	'english': guess_english,
+	'split': guess_split,
+}
+
+# One record per game
+RESULT_TYPE = np.dtype([('word', np.int32), ('won', np.bool_),
+	('guesses', np.uint8), ('misses', np.uint8)])
+
+# Set in each worker process by init_worker, so the index is built once per process
+worker_words = None
+worker_index = None
+
+def init_worker(wordlist):
+	global worker_words, worker_index
+	worker_words = wordlist
+	worker_index = WordIndex(wordlist)
+
+def play_chunk(task):
+	"""
+	Plays the words worker_words[start:stop] with one strategy.
+
+	task: tuple (strategy name, start, stop, number of wrong guesses allowed)
+	returns: tuple (strategy name, array of RESULT_TYPE records)
+	"""
+	name, start, stop, guesses = task
+	strategy = STRATEGIES[name]
+	results = np.zeros(stop - start, dtype=RESULT_TYPE)
+	for i in xrange(start, stop):
+		won, guessed, misses = solve(worker_index, worker_words[i], guesses, strategy)
+		results[i - start] = (i, won, guessed, misses)
+	return (name, results)
+
+def run_tournament(wordlist, strategies, guesses=8, chunk_size=1000, processes=None):
+	"""
+	Plays every word in wordlist with every named strategy, in a pool of
+	processes worker processes (all CPUs if None, no pool if 1).
+
+	wordlist: list of lowercase words
+	strategies: list of keys of STRATEGIES
+	returns: dict of strategy name -> array of RESULT_TYPE records, one per
+		word, in word list order
+	"""
+	tasks = [(name, start, min(start + chunk_size, len(wordlist)), guesses)
+		for name in strategies for start in xrange(0, len(wordlist), chunk_size)]
+
+	if processes == 1:
+		init_worker(wordlist)
+		chunks = map(play_chunk, tasks)
+	else:
+		pool = multiprocessing.Pool(processes, init_worker, (wordlist,))
+		try:
+			chunks = pool.map(play_chunk, tasks, chunksize=1)
+		finally:
+			pool.close()
+			pool.join()
+
+	results = {}
+	for name in strategies:
+		results[name] = np.concatenate([r for n, r in chunks if n == name] or
+			[np.zeros(0, dtype=RESULT_TYPE)])
+	return results
+
+def main(argv=None):
+	parser = argparse.ArgumentParser(description='Play hangman strategies against every word in a word list.')
+	parser.add_argument('words', nargs='?', default=hangman.WORDLIST_FILENAME,
+		help='word list file (default %(default)s)')
+	parser.add_argument('-s', '--strategies', nargs='+', default=['informative'],
+		choices=sorted(STRATEGIES))
+	parser.add_argument('-g', '--guesses', type=int, default=8,
+		help='wrong guesses allowed (default %(default)s)')
+	parser.add_argument('-o', '--output', default='hangman_results.npz',
+		help='.npz file to save one array of results per strategy to')
+	parser.add_argument('-p', '--processes', type=int, default=None,
+		help='worker processes (default: one per CPU)')
+	parser.add_argument('--chunk-size', type=int, default=1000)
+	args = parser.parse_args(argv)
+
+	hangman.WORDLIST_FILENAME = args.words
+	wordlist = hangman.load_words()
+	start = time.time()
+	results = run_tournament(wordlist, args.strategies, args.guesses,
+		args.chunk_size, args.processes)
+	elapsed = time.time() - start
+	np.savez(args.output, **results)
+
+	print "%-12s  %8s  %12s  %12s" % ('strategy', 'win rate', 'mean guesses', 'mean misses')
+	for name in args.strategies:
+		r = results[name]
+		print "%-12s  %8.4f  %12.2f  %12.2f" % (name, r['won'].mean(), r['guesses'].mean(),
+			r['misses'].mean())
+	print len(wordlist) * len(args.strategies), "games in", round(elapsed, 1), "seconds"
+
+if __name__ == '__main__':
+	main()
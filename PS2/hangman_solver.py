@@ -0,0 +1,261 @@
+# PS 2.2 Hangman Game, automated player
+#
+# Plays hangman without a human by keeping the set of words that still match
+# everything revealed so far. Words are grouped by length and numbered within
+# their group, and every set of words is stored as a bitset: a Python integer
+# whose bit i is set when word i is in the set. For each length the index keeps
+# one bitset per letter (words containing it) and one per (position, letter)
+# (words with that letter at that position), so a reveal narrows the candidates
+# with a few bitwise ANDs instead of rescanning the word list.
+
+import binascii
+import string
+from collections import OrderedDict
+
+# Number of guesses into a game for which best_letter() answers are cached
+CACHE_DEPTH = 5
+
+# Most best_letter() answers kept; the least recently used are dropped first
+CACHE_SIZE = 1024
+
+# Candidate sets this small are scanned word by word instead of by popcount
+SMALL_SET = 256
+
+def popcount(bits):
+	"""
+	Returns the number of set bits in a bitset.
+	"""
+	return bin(bits).count('1')
+
+def bit_indices(bits):
+	"""
+	Returns the list of positions of the set bits in a bitset, lowest first.
+	Takes one pass per set bit, so it is fast for sparse bitsets.
+	"""
+	indices = []
+	while bits:
+		low = bits & -bits
+		indices.append(low.bit_length() - 1)
+		bits ^= low
+	return indices
+
+def to_bitset(indices, size):
+	"""
+	Returns a bitset with the bits at indices set.
+
+	indices: iterable of ints, each 0 <= i < size
+	size: int >= 0
+	"""
+	bitmap = bytearray((size + 7) // 8)
+	for i in indices:
+		bitmap[i >> 3] |= 1 << (i & 7)
+	if not bitmap:
+		return 0
+	bitmap.reverse()
+	return int(binascii.hexlify(bytes(bitmap)), 16)
+
+class WordIndex(object):
+	"""
+	Bitset index of a word list, built once and shared by any number of games.
+
+	words: dict of length -> list of words of that length
+	has_letter: dict of length -> dict of letter -> bitset
+	at: dict of length -> dict of (position, letter) -> bitset
+	best_letters: LRU cache used by HangmanSolver.best_letter()
+	"""
+	def __init__(self, wordlist):
+		"""
+		wordlist: list of lowercase words
+		"""
+		self.words = {}
+		for word in set(wordlist):
+			self.words.setdefault(len(word), []).append(word)
+
+		self.has_letter = {}
+		self.at = {}
+		self.best_letters = OrderedDict()
+		for length, words in self.words.iteritems():
+			words.sort()
+			has_letter = {}
+			at = {}
+			for i, word in enumerate(words):
+				for pos, letter in enumerate(word):
+					has_letter.setdefault(letter, set()).add(i)
+					at.setdefault((pos, letter), []).append(i)
+			self.has_letter[length] = dict((letter, to_bitset(indices, len(words)))
+				for letter, indices in has_letter.iteritems())
+			self.at[length] = dict((key, to_bitset(indices, len(words)))
+				for key, indices in at.iteritems())
+
+	def all_words(self, length):
+		"""
+		Returns a bitset of every word with the given length.
+		"""
+		return (1 << len(self.words.get(length, ()))) - 1
+
+class HangmanSolver(object):
+	"""
+	The state of one automated game: the candidate words that match every
+	reveal so far, how many there are and the letters already guessed.
+
+	Example:
+	>>> solver = HangmanSolver(WordIndex(['cat', 'cot', 'dog', 'bird']), 3)
+	>>> solver.update('o', [])
+	>>> solver.remaining()
+	['cat']
+	"""
+	def __init__(self, index, length):
+		"""
+		index: WordIndex
+		length: int, length of the secret word
+		"""
+		self.index = index
+		self.length = length
+		self.candidates = index.all_words(length)
+		self.count = len(index.words.get(length, ()))
+		self.guessed = ''
+
+	def update(self, letter, positions):
+		"""
+		Narrows the candidates after guessing letter.
+
+		letter: lowercase letter
+		positions: list of positions where the letter was revealed, empty
+			for a wrong guess
+		"""
+		self.guessed += letter
+		at = self.index.at.get(self.length, {})
+		if not positions:
+			self.candidates &= ~self.index.has_letter.get(self.length, {}).get(letter, 0)
+		else:
+			for pos in xrange(self.length):
+				if pos in positions:
+					self.candidates &= at.get((pos, letter), 0)
+				else:
+					self.candidates &= ~at.get((pos, letter), 0)
+		self.count = popcount(self.candidates)
+
+	def letter_counts(self):
+		"""
+		Returns a dict of letter -> number of candidates containing it, for
+		every letter not guessed yet.
+		"""
+		counts = dict.fromkeys([l for l in string.ascii_lowercase if not l in self.guessed], 0)
+		if self.count <= SMALL_SET:
+			# Counting letters in a few words is cheaper than 26 popcounts
+			for word in self.remaining():
+				for letter in set(word):
+					if letter in counts:
+						counts[letter] += 1
+			return counts
+		has_letter = self.index.has_letter.get(self.length, {})
+		for letter in counts:
+			counts[letter] = popcount(self.candidates & has_letter.get(letter, 0))
+		return counts
+
+	def letter_splits(self):
+		"""
+		Returns a dict of letter -> the sum of the squared sizes of the groups
+		the candidates would be split into by guessing it, for every letter not
+		guessed yet. Candidates are in the same group when the letter would be
+		revealed at the same positions in them (a miss is one more group), so
+		dividing by the number of candidates gives the expected number left
+		after the guess.
+		"""
+		splits = {}
+		if self.count <= SMALL_SET:
+			groups = {}
+			for word in self.remaining():
+				patterns = {}
+				for pos, letter in enumerate(word):
+					patterns[letter] = patterns.get(letter, 0) | (1 << pos)
+				for key in patterns.iteritems():
+					groups[key] = groups.get(key, 0) + 1
+			hits = dict.fromkeys(string.ascii_lowercase, 0)
+			squares = dict.fromkeys(string.ascii_lowercase, 0)
+			for (letter, pattern), size in groups.iteritems():
+				hits[letter] += size
+				squares[letter] += size * size
+			for letter in string.ascii_lowercase:
+				if not letter in self.guessed:
+					misses = self.count - hits[letter]
+					splits[letter] = squares[letter] + misses * misses
+			return splits
+		has_letter = self.index.has_letter.get(self.length, {})
+		at = self.index.at.get(self.length, {})
+		for letter in string.ascii_lowercase:
+			if letter in self.guessed:
+				continue
+			groups = [self.candidates & has_letter.get(letter, 0)]
+			for pos in xrange(self.length):
+				bits = at.get((pos, letter), 0)
+				split = []
+				for group in groups:
+					inside = group & bits
+					for part in (inside, group ^ inside):
+						if part:
+							split.append(part)
+				groups = split
+			misses = self.count - sum([popcount(group) for group in groups])
+			splits[letter] = sum([popcount(group) ** 2 for group in groups]) + misses * misses
+		return splits
+
+	def best_letter(self):
+		"""
+		Returns the most informative unguessed letter: the one that leaves the
+		fewest candidates on average, counting every way it could be revealed
+		and the chance of a miss. Letters in no candidate are never chosen
+		while another is left. Ties go to the letter in more candidates, then
+		to the earlier letter.
+
+		The first few guesses of every game start from a handful of shared
+		states over large candidate sets, so their answers are kept in the index.
+		"""
+		cache = self.index.best_letters
+		key = None
+		if len(self.guessed) < CACHE_DEPTH:
+			key = (self.length, self.guessed, self.candidates)
+			letter = cache.pop(key, None)
+			if letter is not None:
+				cache[key] = letter
+				return letter
+		counts = self.letter_counts()
+		splits = self.letter_splits()
+		letters = [letter for letter in sorted(counts) if counts[letter] > 0] or sorted(counts)
+		letter = min(letters, key=lambda letter: (splits[letter], -counts[letter]))
+		if key is not None:
+			cache[key] = letter
+			if len(cache) > CACHE_SIZE:
+				cache.popitem(last=False)
+		return letter
+
+	def remaining(self):
+		"""
+		Returns the list of candidate words.
+		"""
+		words = self.index.words.get(self.length, [])
+		return [words[i] for i in bit_indices(self.candidates)]
+
+def solve(index, word, guesses, strategy=HangmanSolver.best_letter):
+	"""
+	Plays one game of hangman against the secret word. Returns a tuple (won,
+	letters guessed, wrong guesses).
+
+	index: WordIndex
+	word: string, the secret word
+	guesses: int, number of wrong guesses allowed
+	strategy: function taking a HangmanSolver and returning a letter that has
+		not been guessed yet, HangmanSolver.best_letter by default
+	"""
+	solver = HangmanSolver(index, len(word))
+	found = 0
+	misses = 0
+	while found < len(word) and misses < guesses:
+		letter = strategy(solver)
+		positions = [i for i in xrange(len(word)) if word[i] == letter]
+		solver.update(letter, positions)
+		if positions:
+			found += len(positions)
+		else:
+			misses += 1
+	return (found == len(word), len(solver.guessed), misses)
@@ -5,6 +5,78 @@
 
 # 1. Implement the helper functions evaluate_poly() and compute_deriv().
 # 2. Impement the function compute_root() to find the roots of a function using Newton's method
+# 3. Polynomial stores the coefficients in a compact array of floats and evaluates
+#    the polynomial and its derivative together using Horner's rule.
+# 4. safe_root() is a version of compute_root() that cannot loop forever. It falls
+#    back to bisection inside a bracket and reports statistics for every call.
+
+from array import array
+import math
+
+class Polynomial(object):
+	"""
+	A polynomial function. Coefficients are stored lowest power first, as in the
+	tuples used by evaluate_poly() and compute_deriv().
+
+	Example:
+	>>> p = Polynomial((-13.39, 0.0, 17.5, 3.0, 1.0))    # x^4 + 3x^3 + 17.5x^2 - 13.39
+	>>> p(2)
+	96.61
+	>>> p.value_and_deriv(2)
+	(96.61, 138.0)
+	>>> p.deriv().coeffs
+	array('d', [0.0, 35.0, 9.0, 4.0])
+	"""
+	__slots__ = ('coeffs', '_deriv')
+
+	def __init__(self, coeffs):
+		"""
+		coeffs: sequence of numbers, length > 0
+		"""
+		self.coeffs = array('d', coeffs)
+		self._deriv = None
+
+	def __len__(self):
+		return len(self.coeffs)
+
+	def __call__(self, x):
+		"""
+		Returns the value of the polynomial at x.
+		"""
+		ans = 0.0
+		for c in reversed(self.coeffs):
+			ans = ans * x + c
+		return ans
+
+	def value_and_deriv(self, x):
+		"""
+		Returns a tuple (f(x), f'(x)) computed in a single pass over the coefficients.
+		"""
+		ans = 0.0
+		deriv = 0.0
+		for c in reversed(self.coeffs):
+			deriv = deriv * x + ans
+			ans = ans * x + c
+		return (ans, deriv)
+
+	def deriv(self):
+		"""
+		Returns the derivative as a Polynomial. The result is computed once and
+		kept, so repeated calls (and calls on the derivative) are free. If the
+		derivative is 0, its coefficients are (0.0,).
+		"""
+		if self._deriv is None:
+			coeffs = self.coeffs
+			self._deriv = Polynomial([coeffs[i] * i for i in xrange(1, len(coeffs))] or [0.0])
+		return self._deriv
+
+def as_polynomial(poly):
+	"""
+	Returns poly as a Polynomial, converting a tuple of coefficients if needed.
+	"""
+	if isinstance(poly, Polynomial):
+		return poly
+	return Polynomial(poly)
 
 
 def evaluate_poly(poly, x):
@@ -17,21 +89,12 @@ def evaluate_poly(poly, x):
 	>>> print evaluate_poly(poly, x)  # f(-13) = 7(-13)^4 + 9.3(-13)^3 + 5(-13)^2
 	180339.9
 
-	poly: tuple of numbers, length > 0
+	poly: tuple of numbers or Polynomial, length > 0
 	x: number
 	returns: float
 	"""
 	
-	ans = 0
-	for i in range(0,len(poly)):
-		ans += (poly[i] * x**i)
-	return ans
-
-poly = (0.0, 0.0, 5.0, 9.3, 7.0)
-x = -13
-print "Evaluate Poly"
-print poly, x
-print evaluate_poly(poly, x)
+	return as_polynomial(poly)(x)
 
 def compute_deriv(poly):
 	"""
@@ -43,19 +106,16 @@ def compute_deriv(poly):
 	>>> print compute_deriv(poly)        # 4x^3 + 9x^2 + 35^x
 	(0.0, 35.0, 9.0, 4.0)
 
-	poly: tuple of numbers, length > 0
+	A constant polynomial (length 1) has no derivative terms, so gives ().
+
+	poly: tuple of numbers or Polynomial, length > 0
 	returns: tuple of numbers
 	"""
 	
-	ans = ()
-	for i in range(1,len(poly)):
-		ans += (poly[i] * i,)
-	return ans 
-
-poly = (-13.39, 0.0, 17.5, 3.0, 1.0)
-print "Compute Derivative"
-print poly
-print compute_deriv(poly)
+	poly = as_polynomial(poly)
+	if len(poly.coeffs) == 1:
+		return ()
+	return tuple(poly.deriv().coeffs)
 
 def compute_root(poly, x_0, epsilon):
 	"""
@@ -70,7 +130,7 @@ def compute_root(poly, x_0, epsilon):
 	>>> print compute_root(poly, x_0, epsilon)
 	(0.80679075379635201, 8.0)
 
-	poly: tuple of numbers, length > 1.
+	poly: tuple of numbers or Polynomial, length > 1.
 		Represents a polynomial function containing at least one real root.
 		The derivative of this polynomial function at x_0 is not 0.
 	x_0: float
@@ -78,21 +138,162 @@ def compute_root(poly, x_0, epsilon):
 	returns: tuple (float, int)
 	"""
 	# Calculate X0
+	poly = as_polynomial(poly)
 	x = x_0
-	root = evaluate_poly(poly, x)
+	root, deriv = poly.value_and_deriv(x)
 	count = 1
 	if abs(root) < epsilon:
 		return (x, count)
 	else:
 		while True:
 			count = count + 1
-			x -= ((evaluate_poly(poly, x))/(evaluate_poly(compute_deriv(poly), x)))
-			root = evaluate_poly(poly, x)
+			x -= root / deriv
+			root, deriv = poly.value_and_deriv(x)
 			if abs(root) < epsilon:
 				return (x, count)
 
-poly = (-13.39, 0.0, 17.5, 3.0, 1.0)
-x_0 = 0.1
-epsilon = .0001
-print "Compute Root"
-print compute_root(poly, x_0, epsilon)
+class RootStats(object):
+	"""
+	Statistics for one call to safe_root().
+
+	root: the last x tried
+	iterations: number of times the polynomial was evaluated, counted as in
+		compute_root()
+	residuals: list of |f(x)| after each iteration
+	fallbacks: number of bisection steps taken instead of Newton steps
+	converged: True if |f(root)| < epsilon
+	"""
+	__slots__ = ('root', 'iterations', 'residuals', 'fallbacks', 'converged')
+
+	def __init__(self):
+		self.root = None
+		self.iterations = 0
+		self.residuals = []
+		self.fallbacks = 0
+		self.converged = False
+
+class StatsLog(object):
+	"""
+	A sink for safe_root() that keeps running totals over many calls.
+
+	Example:
+	>>> log = StatsLog()
+	>>> safe_root((-13.39, 0.0, 17.5, 3.0, 1.0), 0.1, .0001, sink=log)
+	(0.8067907537963521, 8)
+	>>> log.calls, log.iterations, log.failures
+	(1, 8, 0)
+	"""
+	def __init__(self):
+		self.calls = 0
+		self.iterations = 0
+		self.fallbacks = 0
+		self.failures = 0
+
+	def __call__(self, stats):
+		self.calls += 1
+		self.iterations += stats.iterations
+		self.fallbacks += stats.fallbacks
+		if not stats.converged:
+			self.failures += 1
+
+	def mean_iterations(self):
+		if self.calls == 0:
+			return 0.0
+		return float(self.iterations) / self.calls
+
+def safe_root(poly, x_0, epsilon, bracket=None, max_iter=100, sink=None):
+	"""
+	Uses Newton's method to find a root of a polynomial function, like
+	compute_root(), but gives up after max_iter iterations.
+
+	If bracket (a, b) is given, f(a) and f(b) must have opposite signs, unless one
+	of them is already within epsilon of 0, in which case that end is returned.
+	Otherwise the search stays inside the bracket: whenever a Newton step would
+	leave the bracket, or the derivative is 0, a bisection step is taken instead,
+	and the bracket shrinks after every step. Without a bracket the search stops
+	early if the derivative is 0 or the value is no longer a finite number.
+
+	If sink is given, it is called with a RootStats for the call.
+
+	Example:
+	>>> poly = (-13.39, 0.0, 17.5, 3.0, 1.0)    #x^4 + 3x^3 + 17.5x^2 - 13.39
+	>>> safe_root(poly, 0.0, .0001, bracket=(0.0, 2.0))
+	(0.8067886686999606, 5)
+
+	poly: tuple of numbers or Polynomial, length > 1
+	x_0: float
+	epsilon: float > 0
+	bracket: tuple (float, float) or None
+	max_iter: int > 0
+	sink: callable taking a RootStats, or None
+	returns: tuple (float, int), the last x tried and the number of iterations.
+		Use the sink to tell whether it converged.
+	"""
+	poly = as_polynomial(poly)
+	stats = RootStats()
+	if bracket is not None:
+		low, high = min(bracket), max(bracket)
+		low_value = poly(low)
+		high_value = poly(high)
+		if abs(low_value) < epsilon:
+			# An end of the bracket is already a root
+			x_0 = low
+		elif abs(high_value) < epsilon:
+			x_0 = high
+		elif low_value * high_value > 0:
+			raise ValueError("bracket does not contain a sign change")
+		elif not low <= x_0 <= high:
+			x_0 = (low + high) / 2.0
+
+	x = float(x_0)
+	root, deriv = poly.value_and_deriv(x)
+	count = 1
+	stats.residuals.append(abs(root))
+
+	while not abs(root) < epsilon and count < max_iter:
+		if deriv != 0:
+			new_x = x - root / deriv
+		else:
+			new_x = None
+
+		if bracket is not None:
+			# Shrink the bracket to the side of x that still has the sign change
+			if (root < 0) == (high_value < 0):
+				high, high_value = x, root
+			else:
+				low, low_value = x, root
+			if new_x is None or not low < new_x < high:
+				new_x = (low + high) / 2.0
+				stats.fallbacks += 1
+		elif new_x is None or math.isinf(new_x) or math.isnan(new_x):
+			break
+
+		x = new_x
+		count = count + 1
+		root, deriv = poly.value_and_deriv(x)
+		stats.residuals.append(abs(root))
+
+	stats.root = x
+	stats.iterations = count
+	stats.converged = abs(root) < epsilon
+	if sink is not None:
+		sink(stats)
+	return (x, count)
+
+if __name__ == '__main__':
+	poly = (0.0, 0.0, 5.0, 9.3, 7.0)
+	x = -13
+	print "Evaluate Poly"
+	print poly, x
+	print evaluate_poly(poly, x)
+
+	poly = (-13.39, 0.0, 17.5, 3.0, 1.0)
+	print "Compute Derivative"
+	print poly
+	print compute_deriv(poly)
+
+	poly = (-13.39, 0.0, 17.5, 3.0, 1.0)
+	x_0 = 0.1
+	epsilon = .0001
+	print "Compute Root"
+	print compute_root(poly, x_0, epsilon)
@@ -0,0 +1,150 @@
+# PS 2.1: Successive Approximation, batched
+#
+# compute_root() in newton.py runs Newton's method for one polynomial from one
+# starting point. compute_roots() runs it for many polynomials from many starting
+# points at once, treating each (polynomial, starting point) pair as a lane of a
+# NumPy array. Lanes that have converged or diverged are masked out, so each
+# iteration only does work for the lanes that are still running.
+#
+# compute_all_roots() finds every complex root of one polynomial at once, as the
+# eigenvalues of its companion matrix, then polishes each one with Newton's method.
+
+import numpy as np
+
+from newton import as_polynomial
+
+def coefficient_array(polys):
+	"""
+	Returns a 2-D float array with one row of coefficients per polynomial,
+	lowest power first, padded with zeros to the length of the longest one.
+
+	polys: sequence of tuples of numbers or Polynomials, each length > 0
+	"""
+	polys = [tuple(as_polynomial(p).coeffs) for p in polys]
+	coeffs = np.zeros((len(polys), max(len(p) for p in polys)))
+	for i, p in enumerate(polys):
+		coeffs[i, :len(p)] = p
+	return coeffs
+
+def horner(coeffs, x):
+	"""
+	Evaluates one polynomial per lane and its derivative using Horner's rule.
+
+	coeffs: 2-D array, one row of coefficients per lane
+	x: 1-D array, one value per lane
+	returns: tuple (array of f(x), array of f'(x))
+	"""
+	ans = np.zeros_like(x)
+	deriv = np.zeros_like(x)
+	for j in xrange(coeffs.shape[1] - 1, -1, -1):
+		deriv = deriv * x + ans
+		ans = ans * x + coeffs[:, j]
+	return (ans, deriv)
+
+def compute_roots(polys, x0s, epsilon, max_iter=100):
+	"""
+	Uses Newton's method to find a root of every polynomial from every starting
+	point. Iteration counts follow compute_root(): a starting point that is
+	already a root counts as 1 iteration.
+
+	A lane diverges if it has not converged after max_iter iterations, or if
+	its iterate stops being a finite number (for example after hitting a zero
+	derivative).
+
+	Example:
+	>>> roots, iters, diverged = compute_roots([(-13.39, 0.0, 17.5, 3.0, 1.0)], [0.1, -1.0], .0001)
+	>>> roots
+	array([[ 0.80679075, -0.9271141 ]])
+	>>> iters
+	array([[8, 3]])
+	>>> diverged
+	array([[False, False]])
+
+	polys: sequence of P tuples of numbers or Polynomials
+	x0s: array of starting points, shape (K,) to use the same starting
+		points for every polynomial, or (P, K)
+	epsilon: float > 0
+	max_iter: int > 0
+	returns: tuple (float array of roots, int array of iteration counts,
+		bool array of divergence flags), each shape (P, K)
+	"""
+	coeffs = coefficient_array(polys)
+	x = np.array(np.broadcast_to(np.asarray(x0s, dtype=float),
+		(len(coeffs), np.shape(x0s)[-1])))
+	iters = np.zeros(x.shape, dtype=int)
+	converged = np.zeros(x.shape, dtype=bool)
+
+	# Index arrays and values for the lanes still running
+	rows, cols = np.indices(x.shape)
+	rows = rows.ravel()
+	cols = cols.ravel()
+	lane_x = x.ravel()
+	count = 1
+
+	with np.errstate(all='ignore'):
+		root, deriv = horner(coeffs[rows], lane_x)
+		while True:
+			done = np.abs(root) < epsilon
+			finished = done | ~np.isfinite(root)
+			converged[rows[done], cols[done]] = True
+			x[rows[finished], cols[finished]] = lane_x[finished]
+			iters[rows[finished], cols[finished]] = count
+
+			running = ~finished
+			rows = rows[running]
+			cols = cols[running]
+			lane_x = lane_x[running]
+			if len(rows) == 0 or count == max_iter:
+				break
+			count += 1
+			lane_x = lane_x - root[running] / deriv[running]
+			root, deriv = horner(coeffs[rows], lane_x)
+
+	x[rows, cols] = lane_x
+	iters[rows, cols] = count
+	return (x, iters, ~converged)
+
+def compute_all_roots(poly, polish=3):
+	"""
+	Finds every complex root of a polynomial as the eigenvalues of its companion
+	matrix, then improves each one with up to polish steps of Newton's method,
+	using Polynomial.value_and_deriv() from newton.py. A step is only kept if it
+	makes the polynomial smaller, so polishing never makes a root worse.
+
+	Example:
+	>>> compute_all_roots((-1.0, 0.0, 1.0))    # x^2 - 1
+	array([ 1.+0.j, -1.+0.j])
+
+	poly: tuple of numbers or Polynomial, length > 0
+	polish: int >= 0
+	returns: complex array of the roots, one per degree, repeated roots
+		repeated
+	"""
+	poly = as_polynomial(poly)
+	coeffs = np.array(poly.coeffs)
+	nonzero = np.flatnonzero(coeffs)
+	if len(nonzero) == 0 or nonzero[-1] == 0:
+		return np.zeros(0, dtype=complex)
+	coeffs = coeffs[:nonzero[-1] + 1]
+
+	# Companion matrix of the monic polynomial: 1s below the diagonal and the
+	# negated lower coefficients in the last column
+	degree = len(coeffs) - 1
+	companion = np.zeros((degree, degree))
+	companion[np.arange(1, degree), np.arange(degree - 1)] = 1
+	companion[:, -1] = -coeffs[:-1] / coeffs[-1]
+	roots = np.linalg.eigvals(companion).astype(complex)
+
+	for i in xrange(degree):
+		x = complex(roots[i])
+		value, deriv = poly.value_and_deriv(x)
+		for step in xrange(polish):
+			if deriv == 0:
+				break
+			new_x = x - value / deriv
+			new_value, new_deriv = poly.value_and_deriv(new_x)
+			if not abs(new_value) < abs(value):
+				break
+			x, value, deriv = new_x, new_value, new_deriv
+		roots[i] = x
+	return roots
@@ -7,13 +7,104 @@
 # Date: 4/28/20
 
 from wordgame import *
+import os
 import time
 from perm import *
+from anagram import AnagramIndex
+from trie import WordGraph
+from wordtable import WordTable
+from wordcache import BestWordCache
+import numpy as np
+
+# Indexes built by word_index_for, keyed by (index type, id of the word list). The
+# word list is kept alongside its index, so its id can't be reused by another list.
+_word_indexes = {}
+
+def word_index_for(word_list, index_type=WordGraph):
+    """
+    Returns an index of word_list, building it the first time it is asked for and
+    reusing it after that, so functions called without a word_index don't rebuild
+    one on every move. The word list should not be changed once it is indexed.
+
+    word_list: list (string)
+    index_type: AnagramIndex, WordGraph or WordTable
+    """
+    key = (index_type, id(word_list))
+    entry = _word_indexes.get(key)
+    if entry is None or entry[0] is not word_list:
+        entry = (word_list, index_type(word_list))
+        _word_indexes[key] = entry
+    return entry[1]
 
 
 # Problem 1: Implement a function that allows the CPU to choose a word
 
-def comp_choose_word(hand, word_list):
+def comp_choose_word(hand, word_list, word_index=None, cache=None):
+    """
+    Given a hand and a word_dict, find the word that gives the maximum value score, and return it.
+    This word is found by asking an index of the word list for every playable word, rather
+    than checking every permutation of the hand. If a cache is given, hands already in it
+    are answered from it, and new ones are added to it.
+
+    hand: dictionary (string -> int)
+    word_list: list (string)
+    word_index: AnagramIndex, WordGraph or WordTable of word_list, the shared WordGraph from word_index_for if None
+    cache: BestWordCache or None
+    """
+    if cache is not None:
+        cached = cache.lookup(hand)
+        if cached is not None:
+            return cached[0]
+    if word_index is None:
+        word_index = word_index_for(word_list)
+    hand_len = calculate_handlen(hand)
+    best_word = best_candidate(word_index.playable(hand), hand_len)
+    if cache is not None:
+        cache.store(hand, best_word, get_word_score(best_word, hand_len))
+    return best_word
+
+def best_candidate(candidates, hand_len):
+    """
+    Returns the highest scoring word among the candidates, or '' if there are none.
+
+    candidates: list of (word, score without bonus)
+    hand_len: int, number of letters in the hand
+    """
+    high_score = 0
+    best_word = ''
+    for word, score in candidates:
+        # Add the bonus for using every letter, as get_word_score(word, hand_len) does
+        if len(word) == hand_len:
+            score += 50
+        if score > high_score:
+            best_word = word
+            high_score = score
+    return best_word
+
+def narrow_candidates(candidates, hand, word):
+    """
+    Returns the candidates that can still be made from hand after word was
+    played from it. Every word that can be made from what is left of a hand was
+    already a candidate for the whole hand, so the CPU player keeps its list of
+    candidates from turn to turn and only drops the ones that no longer fit,
+    instead of searching the word list again. Only the letters in word have
+    changed, so only those are checked.
+
+    candidates: list of (word, score)
+    hand: dictionary (string -> int) or Hand, after word was played
+    word: string
+    """
+    letters = [(letter, hand.get(letter, 0)) for letter in set(word)]
+    kept = []
+    for candidate in candidates:
+        for letter, count in letters:
+            if candidate[0].count(letter) > count:
+                break
+        else:
+            kept.append(candidate)
+    return kept
+
+def comp_choose_word_perms(hand, word_list):
     """
 	Given a hand and a word_dict, find the word that gives the maximum value score, and return it.
    	This word should be calculated by considering all possible permutations of lengths 1 to HAND_SIZE.
@@ -37,10 +128,134 @@ def comp_choose_word(hand, word_list):
                     high_score = score
     #print "Best word is ", best_word, " at ", high_score, " points"
     return best_word
+
+# Number of words checked between looks at the clock in comp_choose_word_anytime
+ANYTIME_CHUNK = 4096
+
+def comp_choose_word_anytime(hand, word_list, time_budget, word_table=None):
+    """
+    Finds the word with the highest score for the hand, like comp_choose_word, but
+    stops after time_budget seconds and returns the best word found so far.
+
+    Words are tried from the highest score to the lowest, a chunk at a time, so the
+    first playable word found is the best one, and words scoring less than the
+    best word found so far are never tried. Words using the whole hand are tried
+    first because of their bonus.
+
+    Returns a tuple (word, fraction of the word table covered). The fraction is
+    1.0 unless the time ran out, in which case the word may not be the best one.
+
+    hand: dictionary (string -> int) or Hand
+    word_list: list (string)
+    time_budget: float, seconds
+    word_table: WordTable of word_list, the shared one from word_index_for if None
+    """
+    if word_table is None:
+        word_table = word_index_for(word_list, WordTable)
+    deadline = time.time() + time_budget
+    hand_len = calculate_handlen(hand)
+    best_word = ''
+    high_score = 0
+
+    # 1. Words using every letter, with the bonus
+    whole = word_table.fits(hand, np.flatnonzero(word_table.lengths == hand_len))
+    if len(whole):
+        i = whole[np.argmax(word_table.scores[whole])]
+        best_word = word_table.words[i]
+        high_score = word_table.scores[i] + 50
+
+    # 2. The rest, from the highest score down, until a word is found or the
+    # scores left are too low to matter
+    order = word_table.by_score
+    order = order[word_table.lengths[order] < hand_len]
+    checked = 0
+    while checked < len(order) and time.time() < deadline:
+        chunk = order[checked:checked + ANYTIME_CHUNK]
+        if word_table.scores[chunk[0]] <= high_score:
+            checked = len(order)
+            break
+        checked += len(chunk)
+        found = word_table.fits(hand, chunk)
+        if len(found) and word_table.scores[found[0]] > high_score:
+            best_word = word_table.words[found[0]]
+            high_score = word_table.scores[found[0]]
+            checked = len(order)
+            break
+
+    if len(order) == 0:
+        return (best_word, 1.0)
+    return (best_word, float(checked) / len(order))
+
+def comp_greedy_words(hand, word_list, word_index=None):
+    """
+    Plays the hand the way comp_play_hand does, choosing the best single word
+    each turn, without printing anything. Returns a tuple (list of words played,
+    total score).
+
+    hand: dictionary (string -> int)
+    word_list: list (string)
+    word_index: AnagramIndex, WordGraph or WordTable of word_list, the shared WordGraph from word_index_for if None
+    """
+    if word_index is None:
+        word_index = word_index_for(word_list)
+    current_hand = Hand(hand)
+    start_hand_len = len(current_hand)
+    candidates = word_index.playable(current_hand)
+    words = []
+    total_score = 0
+    comp_word = best_candidate(candidates, len(current_hand))
+    while comp_word != '':
+        words.append(comp_word)
+        total_score += get_word_score(comp_word, start_hand_len)
+        current_hand.apply(comp_word)
+        candidates = narrow_candidates(candidates, current_hand, comp_word)
+        comp_word = best_candidate(candidates, len(current_hand))
+    return (words, total_score)
+
+def comp_choose_words(hand, word_list, word_index=None):
+    """
+    Finds the sequence of words that gives the highest total score for the
+    whole hand, which playing the best single word each turn does not always
+    do. Searches every way of splitting the hand into words, remembering the
+    best result for each set of letters left so that it is only worked out once.
+    The letters left are kept in one Hand that is changed in place with apply()
+    and undo(), rather than copied for every word tried.
+    Returns a tuple (list of words, total score).
+
+    hand: dictionary (string -> int)
+    word_list: list (string)
+    word_index: AnagramIndex, WordGraph or WordTable of word_list, the shared WordGraph from word_index_for if None
+    """
+    if word_index is None:
+        word_index = word_index_for(word_list)
+    current_hand = Hand(hand)
+    start_hand_len = len(current_hand)
+    # best: dictionary (Hand.key() of letters left -> (total score, tuple of words))
+    best = {}
+
+    def best_for():
+        key = current_hand.key()
+        if key in best:
+            return best[key]
+        result = (0, ())
+        for word, score in word_index.playable(current_hand):
+            if len(word) == start_hand_len:
+                score += 50
+            current_hand.apply(word)
+            rest_score, rest_words = best_for()
+            current_hand.undo(word)
+            if score + rest_score > result[0]:
+                result = (score + rest_score, (word,) + rest_words)
+        best[key] = result
+        return result
+
+    total_score, words = best_for()
+    return (list(words), total_score)
+
 #
 # Problem 2: Implement a function that allows CPU to play a hand
 #
-def comp_play_hand(hand, word_list):
+def comp_play_hand(hand, word_list, word_index=None, optimal=False, time_budget=None, cache=None):
     """
     Allows the computer to play the given hand, as follows:
 
@@ -52,12 +267,30 @@ def comp_play_hand(hand, word_list):
     * The sum of the word scores is displayed when the hand finishes.
     * The hand finishes when the computer has exhausted its possible choices (i.e. comp_play_hand returns None).
 
+    If optimal is True, the computer plays the words found by comp_choose_words instead,
+    which give the highest total score for the hand. If time_budget is given, each word
+    is chosen by comp_choose_word_anytime within that many seconds. Otherwise, if a cache
+    is given, each word is looked up in it before searching, and stored in it after.
+
     hand: dictionary (string -> int)
     word_list: list (string)
+    word_index: AnagramIndex, WordGraph or WordTable of word_list, the shared WordGraph from word_index_for if None
+        (the shared WordTable if time_budget is given)
+    optimal: boolean
+    time_budget: float, seconds, or None
+    cache: BestWordCache or None
     """
+    if time_budget is not None and not isinstance(word_index, WordTable):
+        word_index = word_index_for(word_list, WordTable)
+    if word_index is None:
+        word_index = word_index_for(word_list)
+    plan = None
+    candidates = None
+    if optimal:
+        plan = comp_choose_words(hand, word_list, word_index)[0]
     end_hand = False
     total_score = 0
-    current_hand = hand.copy()
+    current_hand = Hand(hand)
     start_hand_len = calculate_handlen(current_hand)
    
     while not(end_hand):
@@ -67,12 +300,29 @@ def comp_play_hand(hand, word_list):
         display_hand(current_hand)
 
         # 2. Computer chooses best word
-        comp_word = comp_choose_word(current_hand, word_list)
+        if time_budget is not None:
+            comp_word = comp_choose_word_anytime(current_hand, word_list, time_budget, word_index)[0]
+        elif plan is not None:
+            comp_word = plan.pop(0) if plan else ''
+        else:
+            cached = cache.lookup(current_hand) if cache is not None else None
+            if cached is not None:
+                comp_word = cached[0]
+            else:
+                hand_len = calculate_handlen(current_hand)
+                if candidates is None:
+                    # Words playable from the hand now, narrowed down after each turn
+                    candidates = word_index.playable(current_hand)
+                comp_word = best_candidate(candidates, hand_len)
+                if cache is not None:
+                    cache.store(current_hand, comp_word, get_word_score(comp_word, hand_len))
         word_score = get_word_score(comp_word, start_hand_len)
         total_score += word_score
         if comp_word != '':
             print '"', comp_word, '" earned ', word_score, ' points. Total: ', total_score, ' points'            # 2. Adjust hand
             current_hand = update_hand(current_hand, comp_word)
+            if candidates is not None:
+                candidates = narrow_candidates(candidates, current_hand, comp_word)
 
         if calculate_handlen(current_hand) == 0 or comp_word == '':
             end_hand = True
@@ -83,7 +333,7 @@ def comp_play_hand(hand, word_list):
 # Problem 3: Implement a function to play a game with CPU player
 #
 #
-def play_game(word_list):
+def play_game(word_list, word_index=None, cache=None):
     """Allow the user to play an arbitrary number of hands.
 
     1) Asks the user to input 'n' or 'r' or 'e'.
@@ -100,7 +350,11 @@ def play_game(word_list):
     3) After the computer or user has played the hand, repeat from step 1
 
     word_list: list (string)
+    word_index: AnagramIndex, WordGraph or WordTable of word_list, the shared WordGraph from word_index_for if None
+    cache: BestWordCache or None, used for every CPU hand so replayed hands are not searched again
     """
+    if word_index is None:
+        word_index = word_index_for(word_list)
     hand = {}
     choice1 = ''
 
@@ -129,7 +383,7 @@ def play_game(word_list):
         while make_choice2 == True and choice1 != 'e':
             choice2 = raw_input('Please enter "u" to start a new user hand or "c" to start a new CPU hand:')
             if choice2 == 'c':
-                comp_play_hand(hand, word_list)
+                comp_play_hand(hand, word_list, word_index, cache=cache)
                 make_choice2 = False
             elif choice2 == 'u':
                 make_choice2 = False
@@ -142,4 +396,7 @@ def play_game(word_list):
 #
 if __name__ == '__main__':
     word_list = load_words()
-    play_game(word_list)
+    cache = BestWordCache(path=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'best_words.pkl'))
+    play_game(word_list, cache=cache)
+    cache.save()
+    print "Best word cache:", len(cache), "hands,", cache.hits, "hits,", cache.misses, "misses"
@@ -0,0 +1,61 @@
+# PS 3B Word Game, anagram index
+#
+# Two words that use the same letters have the same signature: their letters in
+# sorted order. An AnagramIndex maps every signature to the valid words that have
+# it, along with their scores. To find every word that can be made from a hand,
+# the CPU player only has to look up the signature of each sub-multiset of the
+# hand (at most 2^7 = 128 for a hand of 7 different letters), instead of checking
+# every permutation of the hand against the word list.
+
+from itertools import product
+
+from wordgame import get_word_score
+
+def signature(letters):
+    """
+    Returns the letters in sorted order as a string.
+
+    letters: string or list of letters
+    """
+    return ''.join(sorted(letters))
+
+class AnagramIndex(object):
+    """
+    Index of a word list by signature.
+
+    Example:
+    >>> index = AnagramIndex(['tea', 'eat', 'ate', 'at', 'zoo'])
+    >>> index.playable({'a': 1, 't': 1, 'e': 1})
+    [('at', 4), ('ate', 9), ('eat', 9), ('tea', 9)]
+    """
+    def __init__(self, word_list):
+        """
+        word_list: list of lowercase strings
+        """
+        # words: dictionary (signature -> list of (word, score without bonus))
+        self.words = {}
+        for word in sorted(set(word_list)):
+            self.words.setdefault(signature(word), []).append((word, get_word_score(word, 0)))
+
+    def lookup(self, letters):
+        """
+        Returns a list of (word, score) for the valid words using exactly these
+        letters. Scores do not include the bonus for using the whole hand.
+        """
+        return self.words.get(signature(letters), [])
+
+    def playable(self, hand):
+        """
+        Returns a list of (word, score) for every valid word that can be made
+        from the letters in hand. Scores do not include the bonus for using the
+        whole hand.
+
+        hand: dictionary (string -> int) or Hand
+        """
+        letters = sorted([letter for letter in hand if hand[letter] > 0])
+        found = []
+        # Each sub-multiset picks between 0 and hand[letter] copies of each letter
+        for counts in product(*[range(hand[letter] + 1) for letter in letters]):
+            sig = ''.join([letter * count for letter, count in zip(letters, counts)])
+            found.extend(self.words.get(sig, ()))
+        return found
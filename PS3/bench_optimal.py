@@ -0,0 +1,58 @@
+# PS 3B Word Game, greedy vs optimal CPU player
+#
+# Deals a large set of random hands and plays each one with the greedy CPU
+# player (comp_greedy_words) and the optimal one (comp_choose_words), reporting
+# how much the optimal player gains and how long each takes.
+#
+# Usage: python bench_optimal.py [number of hands] [hand size] [seed]
+
+import random
+import sys
+import time
+
+from CPUplayer import *
+
+def bench(word_list, word_index, hands, hand_size, seed):
+    """
+    Returns a dict of statistics for playing hands random hands of hand_size
+    letters, dealt after seeding the random module with seed.
+    """
+    random.seed(seed)
+    dealt = [deal_hand(hand_size) for i in range(hands)]
+
+    start = time.time()
+    greedy = [comp_greedy_words(hand, word_list, word_index)[1] for hand in dealt]
+    greedy_time = time.time() - start
+
+    start = time.time()
+    optimal = [comp_choose_words(hand, word_list, word_index)[1] for hand in dealt]
+    optimal_time = time.time() - start
+
+    gains = [o - g for o, g in zip(optimal, greedy)]
+    return {
+        'hands': hands,
+        'greedy_mean': float(sum(greedy)) / hands,
+        'optimal_mean': float(sum(optimal)) / hands,
+        'improved': sum(1 for g in gains if g > 0),
+        'max_gain': max(gains),
+        'worse': sum(1 for g in gains if g < 0),
+        'greedy_ms': 1000 * greedy_time / hands,
+        'optimal_ms': 1000 * optimal_time / hands,
+    }
+
+if __name__ == '__main__':
+    hands = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    hand_size = int(sys.argv[2]) if len(sys.argv) > 2 else HAND_SIZE
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+
+    word_list = load_words()
+    word_index = WordGraph(word_list)
+    stats = bench(word_list, word_index, hands, hand_size, seed)
+
+    print "Hands played:       ", stats['hands'], "of", hand_size, "letters"
+    print "Mean score, greedy: ", round(stats['greedy_mean'], 2)
+    print "Mean score, optimal:", round(stats['optimal_mean'], 2)
+    print "Hands improved:     ", stats['improved'], "(largest gain", stats['max_gain'], "points)"
+    print "Hands made worse:   ", stats['worse']
+    print "Time per hand, greedy:  %.2f ms" % stats['greedy_ms']
+    print "Time per hand, optimal: %.2f ms" % stats['optimal_ms']
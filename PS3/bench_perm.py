@@ -0,0 +1,85 @@
+# PS 3B Word Game, permutation engines
+#
+# Compares get_perms, which builds every ordering of the hand's letters
+# (repeats included) in a list, with multiset_permutations, which yields each
+# distinct string once, both with and without pruning on the prefixes of the
+# words in the word list.
+#
+# Usage: python bench_perm.py [number of hands] [hand size] [seed]
+
+import random
+import sys
+import time
+
+from wordgame import *
+from perm import *
+
+def word_prefixes(word_list):
+    """
+    Returns a set of every prefix of every word in word_list, the words
+    themselves included.
+    """
+    prefixes = set()
+    for word in word_list:
+        for i in range(1, len(word) + 1):
+            prefixes.add(word[:i])
+    return prefixes
+
+def bench(word_list, hands, hand_size, seed):
+    """
+    Returns a dict of statistics for generating every string of every length
+    from hands random hands of hand_size letters, dealt after seeding the
+    random module with seed, with each engine.
+    """
+    random.seed(seed)
+    dealt = [deal_hand(hand_size) for i in range(hands)]
+    words = set(word_list)
+    prefixes = word_prefixes(word_list)
+    stats = {'hands': hands}
+
+    start = time.time()
+    found = 0
+    strings = 0
+    for hand in dealt:
+        for n in range(1, hand_size + 1):
+            perms = get_perms(hand, n)
+            strings += len(perms)
+            found += len(words.intersection(perms))
+    stats['get_perms'] = (strings, found, time.time() - start)
+
+    start = time.time()
+    found = 0
+    strings = 0
+    for hand in dealt:
+        for n in range(1, hand_size + 1):
+            for s in multiset_permutations(hand, n):
+                strings += 1
+                if s in words:
+                    found += 1
+    stats['multiset'] = (strings, found, time.time() - start)
+
+    start = time.time()
+    found = 0
+    strings = 0
+    for hand in dealt:
+        for n in range(1, hand_size + 1):
+            for s in multiset_permutations(hand, n, prefixes.__contains__):
+                strings += 1
+                if s in words:
+                    found += 1
+    stats['pruned'] = (strings, found, time.time() - start)
+    return stats
+
+if __name__ == '__main__':
+    hands = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    hand_size = int(sys.argv[2]) if len(sys.argv) > 2 else HAND_SIZE
+    seed = int(sys.argv[3]) if len(sys.argv) > 3 else 0
+
+    word_list = load_words()
+    stats = bench(word_list, hands, hand_size, seed)
+
+    print "Hands:", stats['hands'], "of", hand_size, "letters"
+    print "%-10s %12s %8s %12s" % ("engine", "strings", "words", "ms per hand")
+    for name in ('get_perms', 'multiset', 'pruned'):
+        strings, found, seconds = stats[name]
+        print "%-10s %12d %8d %12.2f" % (name, strings, found, 1000 * seconds / hands)
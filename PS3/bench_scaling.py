@@ -0,0 +1,236 @@
+# PS 3B Word Game, CPU player scaling benchmark
+#
+# Times each way the CPU player can choose a word, and a whole greedy hand, on
+# seeded hands of 3 to 20 letters and on dictionaries of several sizes sampled
+# from words.txt. Every strategy and dictionary size is run in a fresh worker
+# process, so the growth in its peak memory (resource.getrusage) can be measured
+# too. The results are printed as a table and compared with a baseline saved by
+# an earlier run, and any time or memory that has grown past the tolerance is
+# reported as a regression.
+#
+# Usage: python bench_scaling.py [--hands 10] [--save] [--baseline bench_scaling.json]
+
+import argparse
+import json
+import multiprocessing
+import os
+import random
+import resource
+import sys
+import time
+
+from CPUplayer import *
+
+def choose_perms(hand, word_list, word_index):
+    return comp_choose_word_perms(hand, word_index)
+
+def choose_anytime(hand, word_list, word_index):
+    return comp_choose_word_anytime(hand, word_list, ANYTIME_BUDGET, word_index)[0]
+
+def play_greedy(hand, word_list, word_index):
+    return comp_greedy_words(hand, word_list, word_index)
+
+# Strategy name -> (function word_list -> index, function (hand, word_list, index)).
+# The brute force search is given a set of the words, as a list would make every
+# lookup scan the whole dictionary.
+STRATEGIES = {
+    'perms': (frozenset, choose_perms),
+    'anagram': (AnagramIndex, comp_choose_word),
+    'graph': (WordGraph, comp_choose_word),
+    'table': (WordTable, comp_choose_word),
+    'anytime': (WordTable, choose_anytime),
+    'greedy': (WordGraph, play_greedy),
+}
+STRATEGY_ORDER = ['perms', 'anagram', 'graph', 'table', 'anytime', 'greedy']
+
+# Largest hand each slow strategy is run on
+MAX_HAND_SIZE = {
+    'perms': 7,
+    'anagram': 15,
+}
+
+# Seconds given to comp_choose_word_anytime for each word
+ANYTIME_BUDGET = 0.01
+
+# Growth smaller than these is never reported as a regression, however large
+# it is relative to the baseline
+MIN_REGRESSION_MS = 0.05
+MIN_REGRESSION_MB = 1.0
+
+# Set in each worker process by init_worker
+worker_word_list = None
+
+def init_worker(word_list):
+    global worker_word_list
+    worker_word_list = word_list
+
+def sample_words(word_list, size, seed):
+    """
+    Returns a sorted sample of size words from word_list, or all of word_list if
+    size is at least its length.
+    """
+    if size >= len(word_list):
+        return list(word_list)
+    return sorted(random.Random(seed).sample(word_list, size))
+
+def peak_mb():
+    """
+    Returns the peak resident memory of this process in megabytes.
+    """
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Kilobytes on Linux, bytes on Mac OS X
+    if sys.platform == 'darwin':
+        return peak / 1048576.0
+    return peak / 1024.0
+
+def bench_cell(task):
+    """
+    Builds the index for one strategy on one sampled dictionary and times the
+    strategy on hands of each size.
+
+    task: tuple (strategy name, dictionary size, list of hand sizes, hands per
+        size, seed)
+    returns: dict with the number of words, the index build time in ms, the
+        growth in peak memory in MB, and the ms per hand for each hand size
+    """
+    name, dict_size, hand_sizes, hands, seed = task
+    build, choose = STRATEGIES[name]
+    word_list = sample_words(worker_word_list, dict_size, seed)
+    mb_before = peak_mb()
+
+    start = time.time()
+    word_index = build(word_list)
+    build_ms = 1000 * (time.time() - start)
+
+    times = {}
+    for hand_size in hand_sizes:
+        if hand_size > MAX_HAND_SIZE.get(name, hand_size):
+            continue
+        # The same hands for every strategy and dictionary
+        rng = random.Random(seed + hand_size)
+        dealt = [deal_hand(hand_size, rng) for i in range(hands)]
+        start = time.time()
+        for hand in dealt:
+            choose(hand, word_list, word_index)
+        times[str(hand_size)] = 1000 * (time.time() - start) / hands
+
+    return {
+        'words': len(word_list),
+        'build_ms': build_ms,
+        'mb': peak_mb() - mb_before,
+        'ms': times,
+    }
+
+def run_benchmark(word_list, strategies, dict_sizes, hand_sizes, hands, seed=0, processes=1):
+    """
+    Runs bench_cell for every strategy and dictionary size, each in a new worker
+    process.
+
+    returns: dict ('strategy/dictionary size' -> result of bench_cell)
+    """
+    tasks = [(name, dict_size, hand_sizes, hands, seed)
+        for dict_size in dict_sizes for name in strategies]
+    pool = multiprocessing.Pool(processes, init_worker, (word_list,), maxtasksperchild=1)
+    try:
+        cells = pool.map(bench_cell, tasks, chunksize=1)
+    finally:
+        pool.close()
+        pool.join()
+    return dict(('%s/%d' % (task[0], task[1]), cell) for task, cell in zip(tasks, cells))
+
+def print_table(results, strategies, dict_sizes, hand_sizes, out=sys.stdout):
+    """
+    Prints one table per dictionary size, with a row for each strategy giving
+    its index build time, memory growth and ms per hand for each hand size.
+    """
+    for dict_size in dict_sizes:
+        words = results['%s/%d' % (strategies[0], dict_size)]['words']
+        out.write("\n%d words, ms per hand\n" % words)
+        out.write("%-8s %9s %7s" % ("strategy", "build ms", "MB"))
+        for hand_size in hand_sizes:
+            out.write(" %8d" % hand_size)
+        out.write("\n")
+        for name in strategies:
+            cell = results['%s/%d' % (name, dict_size)]
+            out.write("%-8s %9.1f %7.1f" % (name, cell['build_ms'], cell['mb']))
+            for hand_size in hand_sizes:
+                ms = cell['ms'].get(str(hand_size))
+                out.write(" %8s" % ('-' if ms is None else '%.3f' % ms))
+            out.write("\n")
+
+def find_regressions(results, baseline, tolerance):
+    """
+    Returns a list of messages, one for each time or memory figure in results
+    that is more than tolerance (a fraction) above the same figure in baseline.
+    Figures missing from the baseline are not compared.
+    """
+    def grew(new, old, minimum):
+        return new > old * (1 + tolerance) and new - old > minimum
+
+    regressions = []
+    for key in sorted(results):
+        if key not in baseline:
+            continue
+        cell = results[key]
+        old = baseline[key]
+        if grew(cell['mb'], old['mb'], MIN_REGRESSION_MB):
+            regressions.append("%s: memory %.1f MB, was %.1f MB" % (key, cell['mb'], old['mb']))
+        for hand_size in sorted(cell['ms'], key=int):
+            if hand_size in old['ms'] and grew(cell['ms'][hand_size], old['ms'][hand_size], MIN_REGRESSION_MS):
+                regressions.append("%s: %s letters %.3f ms, was %.3f ms"
+                    % (key, hand_size, cell['ms'][hand_size], old['ms'][hand_size]))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Time the CPU player across hand and dictionary sizes.')
+    parser.add_argument('-n', '--hands', type=int, default=10,
+        help='hands of each size per strategy')
+    parser.add_argument('-s', '--strategies', nargs='+', default=STRATEGY_ORDER,
+        choices=STRATEGY_ORDER)
+    parser.add_argument('--hand-sizes', type=int, nargs='+',
+        default=[3, 4, 5, 6, 7, 8, 10, 12, 15, 20])
+    parser.add_argument('--dict-sizes', type=int, nargs='+', default=[1000, 10000, 100000],
+        help='words sampled from words.txt (all of it if larger)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-p', '--processes', type=int, default=1,
+        help='worker processes run at once (more than one skews the times)')
+    parser.add_argument('--baseline', default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+        'bench_scaling.json'))
+    parser.add_argument('--save', action='store_true',
+        help='save these results as the new baseline instead of comparing with it')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+        help='fraction a figure may grow past the baseline before it is a regression')
+    args = parser.parse_args(argv)
+
+    word_list = load_words()
+    results = run_benchmark(word_list, args.strategies, args.dict_sizes, args.hand_sizes,
+        args.hands, args.seed, args.processes)
+    print_table(results, args.strategies, args.dict_sizes, args.hand_sizes)
+
+    if args.save:
+        f = open(args.baseline, 'w')
+        try:
+            json.dump(results, f, indent=1, sort_keys=True)
+        finally:
+            f.close()
+        print "\nSaved baseline to", args.baseline
+        return 0
+    if not os.path.exists(args.baseline):
+        print "\nNo baseline at", args.baseline, "- run with --save to create one"
+        return 0
+    f = open(args.baseline)
+    try:
+        baseline = json.load(f)
+    finally:
+        f.close()
+    regressions = find_regressions(results, baseline, args.tolerance)
+    if regressions:
+        print "\nRegressions against", args.baseline
+        for message in regressions:
+            print "  " + message
+        return 1
+    print "\nNo regressions against", args.baseline
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
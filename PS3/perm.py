@@ -40,6 +40,76 @@ def get_perms(hand, n):
 			toret.append("".join(p))
 	return toret	
 
+def _multiset_walk(counts, n, prefix_ok, ordered):
+	# Depth first walk over strings of n letters from counts. Each level picks
+	# a letter by its position in letters; left holds the copies still unused.
+	# With ordered False, letters never go backwards, giving each combination once.
+	letters = sorted([l for l in counts if counts[l] > 0])
+	left = [counts[l] for l in letters]
+	if n > sum(left):
+		return
+	if n == 0:
+		yield ''
+		return
+	chosen = []
+	stack = []
+	i = 0
+	while True:
+		while i < len(letters) and left[i] == 0:
+			i += 1
+		if i < len(letters):
+			left[i] -= 1
+			chosen.append(letters[i])
+			if prefix_ok is not None and not prefix_ok(''.join(chosen)):
+				pruned = True
+			elif len(chosen) == n:
+				yield ''.join(chosen)
+				pruned = True
+			else:
+				pruned = False
+			if pruned:
+				chosen.pop()
+				left[i] += 1
+				i += 1
+			else:
+				stack.append(i)
+				if ordered:
+					i = 0
+		elif stack:
+			i = stack.pop()
+			chosen.pop()
+			left[i] += 1
+			i += 1
+		else:
+			return
+
+def multiset_permutations(counts, n, prefix_ok=None):
+	"""
+	Yields every distinct string of n letters that can be made from counts,
+	each exactly once, in alphabetical order. Repeated letters never give
+	repeated strings, and only the current string is kept in memory.
+
+	If prefix_ok is given, it is called with each partial string as it is
+	built, and strings starting with a prefix it returns False for are skipped
+	without being built.
+
+	counts: dictionary (string -> int), like a hand
+	n: int >= 0
+	prefix_ok: function (string -> bool) or None
+	"""
+	return _multiset_walk(counts, n, prefix_ok, True)
+
+def multiset_combinations(counts, n, prefix_ok=None):
+	"""
+	Yields every distinct combination of n letters that can be taken from
+	counts, each exactly once, as a string of letters in alphabetical order.
+
+	counts: dictionary (string -> int), like a hand
+	n: int >= 0
+	prefix_ok: function (string -> bool) or None, as for multiset_permutations
+	"""
+	return _multiset_walk(counts, n, prefix_ok, False)
+
 if __name__=="__main__":
 	print "Permutations of 'love'"
 	for p in xpermutations(['l','o','v','e']): print ''.join(p)
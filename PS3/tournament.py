@@ -0,0 +1,121 @@
+# PS 3B Word Game, CPU tournament
+#
+# Deals a large number of hands from a seeded random number generator and plays
+# every hand with each CPU strategy. Hands are dealt and played in chunks by a
+# pool of worker processes. Each chunk's scores are written to a CSV file as soon
+# as it is finished, so memory use does not grow with the number of hands.
+#
+# Usage: python tournament.py -n 100000 -s greedy optimal -o scores.csv
+
+import argparse
+import csv
+import multiprocessing
+import random
+import sys
+import time
+
+from CPUplayer import *
+
+# Strategy name -> function (hand, word_list, word_index) -> (words, total score)
+STRATEGIES = {
+    'greedy': comp_greedy_words,
+    'optimal': comp_choose_words,
+}
+
+# Set in each worker process by init_worker, so the word graph is built once per process
+worker_word_list = None
+worker_index = None
+
+def init_worker(word_list):
+    global worker_word_list, worker_index
+    worker_word_list = word_list
+    worker_index = WordGraph(word_list)
+
+def deal_hands(n, count, seed):
+    """
+    Returns a list of count random hands of n letters, dealt by a random number
+    generator seeded with seed.
+    """
+    rng = random.Random(seed)
+    return [deal_hand(n, rng) for i in xrange(count)]
+
+def play_chunk(task):
+    """
+    Deals a chunk of hands and plays each one with every strategy.
+
+    task: tuple (first hand number, number of hands, hand size, seed, list of
+        strategy names)
+    returns: list of rows (hand number, letters, score for each strategy)
+    """
+    first, count, hand_size, seed, strategies = task
+    rows = []
+    for i, hand in enumerate(deal_hands(hand_size, count, seed)):
+        letters = ''.join(sorted([letter * hand[letter] for letter in hand]))
+        scores = [STRATEGIES[name](hand, worker_word_list, worker_index)[1] for name in strategies]
+        rows.append([first + i, letters] + scores)
+    return rows
+
+def run_tournament(word_list, out_file, hands, strategies, hand_size=HAND_SIZE,
+        seed=0, chunk_size=1000, processes=None, progress=None):
+    """
+    Plays hands hands of hand_size letters with every strategy and writes one
+    CSV row per hand to out_file. Chunk k of the hands is dealt with seed
+    seed + k, so the hands depend only on seed and chunk_size, not on the
+    number of processes.
+
+    progress: file to report hands per second to after each chunk, or None
+    returns: tuple (hands played, seconds taken)
+    """
+    tasks = [(first, min(chunk_size, hands - first), hand_size, seed + first // chunk_size, strategies)
+        for first in xrange(0, hands, chunk_size)]
+    writer = csv.writer(out_file)
+    writer.writerow(['hand', 'letters'] + strategies)
+
+    start = time.time()
+    played = 0
+    if processes == 1:
+        init_worker(word_list)
+        pool = None
+        chunks = (play_chunk(task) for task in tasks)
+    else:
+        pool = multiprocessing.Pool(processes, init_worker, (word_list,))
+        chunks = pool.imap(play_chunk, tasks)
+    try:
+        for rows in chunks:
+            writer.writerows(rows)
+            played += len(rows)
+            if progress is not None:
+                elapsed = time.time() - start
+                progress.write("%d hands, %.0f hands/s\n" % (played, played / elapsed))
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    return (played, time.time() - start)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Play CPU strategies against each other on many dealt hands.')
+    parser.add_argument('-n', '--hands', type=int, default=10000)
+    parser.add_argument('-s', '--strategies', nargs='+', default=['greedy', 'optimal'],
+        choices=sorted(STRATEGIES))
+    parser.add_argument('--hand-size', type=int, default=HAND_SIZE)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('-o', '--output', default='scores.csv',
+        help='CSV file of per-hand scores, or - for stdout')
+    parser.add_argument('-p', '--processes', type=int, default=None,
+        help='worker processes (default: one per CPU)')
+    parser.add_argument('--chunk-size', type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    word_list = load_words()
+    out_file = sys.stdout if args.output == '-' else open(args.output, 'wb')
+    try:
+        played, elapsed = run_tournament(word_list, out_file, args.hands, args.strategies,
+            args.hand_size, args.seed, args.chunk_size, args.processes, sys.stderr)
+    finally:
+        if out_file is not sys.stdout:
+            out_file.close()
+    sys.stderr.write("Played %d hands in %.1f s: %.0f hands/s\n" % (played, elapsed, played / elapsed))
+
+if __name__ == '__main__':
+    main()
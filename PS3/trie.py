@@ -0,0 +1,120 @@
+# PS 3B Word Game, word graph
+#
+# A WordGraph stores the word list as a trie whose identical subtrees have been
+# merged, which makes it a DAWG (directed acyclic word graph): every word that
+# ends in "ing" shares the same "ing" nodes. To find every word that can be made
+# from a hand, the walker follows only the edges for letters still left in the
+# hand, so a prefix that no word starts with is dropped as soon as it is reached.
+# This works for hands of 15 to 20 letters, where trying every permutation is
+# hopeless.
+
+import string
+
+from wordgame import SCRABBLE_LETTER_VALUES, Hand
+
+LETTERS = string.ascii_lowercase
+LETTER_VALUES = [SCRABBLE_LETTER_VALUES[letter] for letter in LETTERS]
+
+def hand_counts(hand):
+    """
+    Returns a hand as a list of 26 letter counts, a to z.
+
+    hand: dictionary (string -> int) or Hand
+    """
+    if isinstance(hand, Hand):
+        return list(hand.counts)
+    counts = [0] * 26
+    for letter in hand:
+        counts[ord(letter) - ord('a')] += hand[letter]
+    return counts
+
+class WordGraph(object):
+    """
+    A word list stored as a DAWG. Nodes are numbered; edges[node] is a tuple of
+    (letter number, child node) pairs and terminal[node] is True if a word ends
+    at node.
+
+    Example:
+    >>> graph = WordGraph(['tea', 'eat', 'ate', 'at', 'zoo'])
+    >>> sorted(graph.words(hand_counts({'a': 1, 't': 1, 'e': 1})))
+    ['at', 'ate', 'eat', 'tea']
+    """
+    def __init__(self, word_list):
+        """
+        word_list: list of lowercase strings
+        """
+        # 1. Build a trie of nested dicts; the key None marks the end of a word
+        trie = {}
+        for word in word_list:
+            node = trie
+            for letter in word:
+                node = node.setdefault(ord(letter) - ord('a'), {})
+            node[None] = True
+
+        # 2. Number the nodes from the leaves up, giving identical subtrees the
+        # same number
+        self.edges = []
+        self.terminal = []
+        self.root = self._add_node(trie, {})
+
+    def _add_node(self, node, registry):
+        edges = tuple([(letter, self._add_node(node[letter], registry))
+            for letter in sorted(key for key in node if key is not None)])
+        key = (None in node, edges)
+        if not key in registry:
+            registry[key] = len(self.edges)
+            self.edges.append(edges)
+            self.terminal.append(None in node)
+        return registry[key]
+
+    def __len__(self):
+        return len(self.edges)
+
+    def walk(self, counts):
+        """
+        Yields (word, score) for every word that can be made from the letters
+        in counts. Scores do not include the bonus for using the whole hand.
+
+        counts: list of 26 letter counts, a to z
+        """
+        counts = list(counts)
+        edges = self.edges
+        terminal = self.terminal
+        path = []
+        value = 0
+        stack = [iter(edges[self.root])]
+        while stack:
+            for letter, child in stack[-1]:
+                if counts[letter]:
+                    counts[letter] -= 1
+                    path.append(letter)
+                    value += LETTER_VALUES[letter]
+                    if terminal[child]:
+                        yield (''.join([LETTERS[l] for l in path]), value * len(path))
+                    stack.append(iter(edges[child]))
+                    break
+            else:
+                # Every edge from this node has been tried, go back up
+                stack.pop()
+                if path:
+                    letter = path.pop()
+                    counts[letter] += 1
+                    value -= LETTER_VALUES[letter]
+
+    def words(self, counts):
+        """
+        Yields every word that can be made from the letters in counts.
+
+        counts: list of 26 letter counts, a to z
+        """
+        for word, score in self.walk(counts):
+            yield word
+
+    def playable(self, hand):
+        """
+        Returns a list of (word, score) for every valid word that can be made
+        from the letters in hand, like AnagramIndex.playable().
+
+        hand: dictionary (string -> int) or Hand
+        """
+        return list(self.walk(hand_counts(hand)))
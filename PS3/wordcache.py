@@ -0,0 +1,117 @@
+# PS 3B Word Game, best word cache
+#
+# Over a session, and on every replayed hand, the CPU player keeps choosing words
+# for hands it has already seen. A BestWordCache remembers the best word for the
+# most recently used hands, keyed by the hand's letters in sorted order, and can
+# be saved to disk so it carries over to the next session.
+
+import cPickle
+import os
+from collections import OrderedDict
+
+def hand_key(hand):
+    """
+    Returns the letters of the hand in sorted order as a string, the same for any
+    two hands with the same letters.
+
+    hand: dictionary (string -> int) or Hand
+    """
+    return ''.join([letter * count for letter, count in sorted(hand.items())])
+
+class BestWordCache(object):
+    """
+    Bounded cache of the best word and score for a hand, dropping the least
+    recently used hand once it holds max_size of them. hits and misses count the
+    lookups that did and did not find the hand, for sizing the cache.
+
+    Example:
+    >>> cache = BestWordCache(max_size=2)
+    >>> cache.lookup({'a': 1, 't': 1}) is None
+    True
+    >>> cache.store({'t': 1, 'a': 1}, 'at', 54)
+    >>> cache.lookup({'a': 1, 't': 1})
+    ('at', 54)
+    >>> cache.hits, cache.misses
+    (1, 1)
+    """
+    def __init__(self, max_size=4096, path=None):
+        """
+        max_size: int > 0, number of hands to keep
+        path: string, file the cache is loaded from (if it exists) and saved to, or None
+        """
+        self.max_size = max_size
+        self.path = path
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if path is not None and os.path.exists(path):
+            self.load()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def lookup(self, hand):
+        """
+        Returns (word, score) for the hand, or None if it is not cached.
+
+        hand: dictionary (string -> int) or Hand
+        """
+        key = hand_key(hand)
+        entry = self.entries.pop(key, None)
+        if entry is None:
+            self.misses += 1
+            return None
+        # Put the hand back at the most recently used end
+        self.entries[key] = entry
+        self.hits += 1
+        return entry
+
+    def store(self, hand, word, score):
+        """
+        Caches word and its score as the best for the hand.
+
+        hand: dictionary (string -> int) or Hand
+        word: string, '' if no word can be made
+        score: int
+        """
+        key = hand_key(hand)
+        self.entries.pop(key, None)
+        self.entries[key] = (word, score)
+        while len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+
+    def load(self):
+        """
+        Replaces the cached hands with those saved at self.path, least recently
+        used first. A file that is missing, unreadable or does not hold saved
+        hands leaves the cache empty.
+        """
+        self.entries = OrderedDict()
+        try:
+            f = open(self.path, 'rb')
+            try:
+                items = cPickle.load(f)
+            finally:
+                f.close()
+            entries = OrderedDict(items[-self.max_size:])
+        except Exception:
+            # Unpickling can fail in many ways (a truncated file, a missing
+            # module, an object of the wrong shape), and none should stop a game
+            return
+        for key, entry in entries.iteritems():
+            if not (isinstance(key, str) and isinstance(entry, tuple) and len(entry) == 2):
+                return
+        self.entries = entries
+
+    def save(self):
+        """
+        Writes the cached hands to self.path, replacing the file only once the
+        new one is complete.
+        """
+        temp_path = self.path + '.tmp'
+        f = open(temp_path, 'wb')
+        try:
+            cPickle.dump(self.entries.items(), f, cPickle.HIGHEST_PROTOCOL)
+        finally:
+            f.close()
+        os.rename(temp_path, self.path)
@@ -8,6 +8,7 @@
 
 import random
 import string
+from array import array
 
 VOWELS = 'aeiou'
 CONSONANTS = 'bcdfghjklmnpqrstvwxyz'
@@ -59,6 +60,110 @@ def get_frequency_dict(sequence):
 # (end of helper code)
 # -----------------------------------
 
+#
+# Hands as arrays of letter counts
+#
+class Hand(object):
+    """
+    A hand stored as a fixed array of 26 letter counts, a to z, along with the
+    total number of letters. It can be used wherever a hand dictionary is
+    expected: hand[letter], hand.get(letter), hand.keys(), hand.values(),
+    hand.copy() and iterating over the letters all work, counting only letters
+    that are in the hand. len(hand) is the number of letters, found in O(1).
+
+    Unlike a dictionary it can be changed in place without copying, using
+    apply() to remove a word's letters and undo() to put them back.
+
+    Example:
+    >>> hand = Hand({'a':1, 'x':2, 'l':3, 'e':1})
+    >>> len(hand), hand['l']
+    (7, 3)
+    >>> hand.apply('axle')
+    >>> len(hand), sorted(hand.keys())
+    (3, ['l', 'x'])
+    >>> hand.undo('axle')
+    >>> len(hand), hand['a']
+    (7, 1)
+    """
+    __slots__ = ('counts', 'size')
+
+    def __init__(self, letters=()):
+        """
+        letters: dictionary (string -> int), Hand or string of letters
+        """
+        self.counts = array('i', [0] * 26)
+        self.size = 0
+        if isinstance(letters, Hand):
+            self.counts = array('i', letters.counts)
+            self.size = letters.size
+        elif isinstance(letters, dict):
+            for letter in letters:
+                self.counts[ord(letter) - 97] += letters[letter]
+                self.size += letters[letter]
+        else:
+            self.undo(letters)
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, letter):
+        return self.counts[ord(letter) - 97]
+
+    def get(self, letter, default=None):
+        count = self.counts[ord(letter) - 97]
+        if count == 0:
+            return default
+        return count
+
+    def __contains__(self, letter):
+        return self.counts[ord(letter) - 97] > 0
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def keys(self):
+        return [string.ascii_lowercase[i] for i in range(26) if self.counts[i] > 0]
+
+    def values(self):
+        return [c for c in self.counts if c > 0]
+
+    def items(self):
+        return [(string.ascii_lowercase[i], self.counts[i]) for i in range(26) if self.counts[i] > 0]
+
+    def copy(self):
+        return Hand(self)
+
+    def key(self):
+        """
+        Returns a string that is the same for any two hands with the same letters,
+        for use as a dictionary key.
+        """
+        return self.counts.tostring()
+
+    def apply(self, word):
+        """
+        Removes the letters in word from the hand, in place. Raises ValueError,
+        leaving the hand unchanged, if the hand does not have all of them.
+        """
+        counts = self.counts
+        for i, w in enumerate(word):
+            c = ord(w) - 97
+            if counts[c] == 0:
+                for v in word[:i]:
+                    counts[ord(v) - 97] += 1
+                raise ValueError("hand has no %r left for %r" % (w, word))
+            counts[c] -= 1
+        self.size -= len(word)
+
+    def undo(self, word):
+        """
+        Puts the letters in word back in the hand, in place. Reverses apply(word).
+        """
+        counts = self.counts
+        for w in word:
+            counts[ord(w) - 97] += 1
+        self.size += len(word)
+
 #
 # Problem #1: Scoring a word
 #
@@ -116,7 +221,7 @@ def display_hand(hand):
 #
 # Make sure you understand how this function works and what it does!
 #
-def deal_hand(n):
+def deal_hand(n, rng=random):
     """
     Returns a random hand containing n lowercase letters.
     At least n/3 the letters in the hand should be VOWELS.
@@ -126,17 +231,18 @@ def deal_hand(n):
     particular letter is repeated in that hand.
 
     n: int >= 0
+    rng: random.Random to deal from, the random module by default
     returns: dictionary (string -> int)
     """
     hand={}
     num_vowels = int(n / 3)
     
     for i in range(num_vowels):
-        x = VOWELS[random.randrange(0,len(VOWELS))]
+        x = VOWELS[rng.randrange(0,len(VOWELS))]
         hand[x] = hand.get(x, 0) + 1
         
     for i in range(num_vowels, n):    
-        x = CONSONANTS[random.randrange(0,len(CONSONANTS))]
+        x = CONSONANTS[rng.randrange(0,len(CONSONANTS))]
         hand[x] = hand.get(x, 0) + 1
         
     return hand
@@ -157,9 +263,16 @@ def update_hand(hand, word):
     Has no side effects: does not modify hand.
 
     word: string
-    hand: dictionary (string -> int)    
-    returns: dictionary (string -> int)
+    hand: dictionary (string -> int) or Hand
+    returns: dictionary (string -> int) or Hand
     """
+    if isinstance(hand, Hand):
+        # Skip letters the hand has run out of, as for a dictionary
+        new_hand = hand.copy()
+        for w in word:
+            if new_hand[w] > 0:
+                new_hand.apply(w)
+        return new_hand
     new_hand = hand.copy()
     for w in word:
         available = new_hand[w]
@@ -179,22 +292,22 @@ def is_valid_word(word, hand, word_list):
     Does not mutate hand or word_list.
     
     word: string
-    hand: dictionary (string -> int)
+    hand: dictionary (string -> int) or Hand
     word_list: list of lowercase strings
     """
     valid = True
     word_freq = get_frequency_dict(word)
     if word in word_list:
-        for key in word_freq.keys():
-            if not(key in hand.keys()): 
-                valid = False
-            elif hand[key] < word_freq[key]:
+        for key in word_freq:
+            if hand.get(key, 0) < word_freq[key]:
                 valid = False
     else:
         valid = False
     return valid
 
 def calculate_handlen(hand):
+    if isinstance(hand, Hand):
+        return len(hand)
     handlen = 0
     for v in hand.values():
         handlen += v
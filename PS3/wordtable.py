@@ -0,0 +1,88 @@
+# PS 3B Word Game, word table
+#
+# A WordTable keeps the score, length and letter counts of every valid word in
+# NumPy arrays, computed once when the word list is loaded. Finding every word
+# that can be made from a hand is then a few array operations over the whole
+# table instead of a call to get_word_score per candidate word.
+
+import numpy as np
+
+from wordgame import SCRABBLE_LETTER_VALUES, Hand
+from trie import hand_counts
+
+LETTER_VALUES = np.array([SCRABBLE_LETTER_VALUES[chr(97 + i)] for i in range(26)])
+
+class WordTable(object):
+    """
+    Arrays describing a word list, one entry per word.
+
+    words: list of words
+    scores: int array, score of each word without the bonus for using the whole hand
+    lengths: int array, length of each word
+    vectors: uint8 array, shape (number of words, 26), letter counts a to z
+    masks: int array, bit i set if the word contains the ith letter
+    by_score: int array, positions of the words from highest score to lowest
+
+    Example:
+    >>> table = WordTable(['tea', 'eat', 'ate', 'at', 'zoo'])
+    >>> table.playable({'a': 1, 't': 1, 'e': 1})
+    [('at', 4), ('ate', 9), ('eat', 9), ('tea', 9)]
+    """
+    def __init__(self, word_list):
+        """
+        word_list: list of lowercase strings
+        """
+        self.words = sorted(set(word_list))
+        n = len(self.words)
+        self.lengths = np.array([len(word) for word in self.words], dtype=np.int32)
+
+        # Letter codes of every word laid end to end, and the word each belongs to
+        codes = np.frombuffer(''.join(self.words), dtype=np.uint8).astype(np.int32) - 97
+        owners = np.repeat(np.arange(n), self.lengths)
+
+        self.vectors = np.bincount(owners * 26 + codes, minlength=n * 26).reshape(n, 26).astype(np.uint8)
+        self.scores = (np.bincount(owners, weights=LETTER_VALUES[codes], minlength=n) *
+            self.lengths).astype(np.int32)
+        self.masks = ((self.vectors > 0) << np.arange(26)).sum(axis=1)
+        self.by_score = np.argsort(-self.scores, kind='mergesort')
+
+    def __len__(self):
+        return len(self.words)
+
+    def fits(self, hand, indices=None):
+        """
+        Returns the positions, from indices (every word if None), of the words
+        that can be made from the letters in hand, in the same order.
+
+        hand: dictionary (string -> int) or Hand
+        indices: int array of positions in the table, or None
+        """
+        counts = np.array(hand_counts(hand), dtype=np.uint8)
+        hand_mask = ((counts > 0) << np.arange(26)).sum()
+        # Words with a letter that is not in the hand are ruled out by their
+        # masks, so only the rest need their letter counts compared
+        if indices is None:
+            candidates = np.flatnonzero(self.masks & ~hand_mask == 0)
+        else:
+            candidates = indices[self.masks[indices] & ~hand_mask == 0]
+        fits = (self.vectors[candidates] <= counts).all(axis=1)
+        return candidates[fits]
+
+    def playable_indices(self, hand):
+        """
+        Returns an array of the positions in the table of every word that can be
+        made from the letters in hand.
+
+        hand: dictionary (string -> int) or Hand
+        """
+        return self.fits(hand)
+
+    def playable(self, hand):
+        """
+        Returns a list of (word, score) for every valid word that can be made
+        from the letters in hand, like AnagramIndex.playable().
+
+        hand: dictionary (string -> int) or Hand
+        """
+        indices = self.playable_indices(hand)
+        return zip([self.words[i] for i in indices], self.scores[indices].tolist())
@@ -43,7 +43,9 @@ def load_words():
     print "  ", len(wordlist), "words loaded."
     return wordlist
 
-wordlist = load_words()
+# Loaded by decrypt_fable, or when run as a script, so the coding functions can be
+# imported without reading the word list
+wordlist = None
 
 def is_word(wordlist, word):
     """
@@ -232,14 +234,30 @@ def apply_coder(text, coder):
     >>> apply_coder("Khoor,czruog!", build_decoder(3))
     'Hello, world!'
     """
-    out_text = ''
-    for c in text:
-        if coder.get(c) != None:
-            out_text += coder[c]
-        else:
-            out_text += c
-    #print out_text
-    return out_text
+    if not isinstance(coder, dict):
+        # Already a translate table
+        return text.translate(coder)
+    if isinstance(text, str) and all(len(c) == 1 for c in coder.itervalues()):
+        return text.translate(coder_table(coder))
+    return ''.join([coder.get(c, c) for c in text])
+
+def coder_table(coder):
+    """
+    Returns a translate table (a string of 256 characters) that maps each
+    character the way coder does, and leaves every other character alone, so
+    that text.translate(table) applies the coder in one pass.
+
+    coder: dict with mappings of characters to single shifted characters
+    returns: string
+
+    Example:
+    >>> 'Hello, world!'.translate(coder_table(build_encoder(3)))
+    'Khoor,czruog!'
+    """
+    table = [chr(i) for i in range(256)]
+    for c in coder:
+        table[ord(c)] = coder[c]
+    return ''.join(table)
 
 def apply_shift(text, shift):
     """
@@ -258,9 +276,16 @@ def apply_shift(text, shift):
     >>> apply_shift('This is a test.', 8)
     'Apq hq hiham a.'
     """
-    out_text = apply_coder(text, build_encoder(shift))
+    if isinstance(text, str):
+        out_text = apply_coder(text, SHIFT_TABLES[shift % 27])
+    else:
+        out_text = apply_coder(text, build_encoder(shift))
     return out_text
    
+# Translate tables for every shift, built once. A shift of s is the same as a shift
+# of s % 27, so SHIFT_TABLES[shift % 27] works for negative (decoding) shifts too.
+SHIFT_TABLES = [coder_table(build_coder(shift)) for shift in range(27)]
+
 #
 # Problem 2: Codebreaking.
 #
@@ -460,6 +485,9 @@ def decrypt_fable():
     returns: string - fable in plain text
     """
     
+    global wordlist
+    if wordlist is None:
+        wordlist = load_words()
     in_text = get_fable_string()
     shifts = find_best_shifts(wordlist, in_text)
     out_text = (apply_shifts(in_text, shifts))
@@ -468,6 +496,7 @@ def decrypt_fable():
 
 #What is the moral of the story?
 if __name__ == '__main__':
+    wordlist = load_words()
     fable = decrypt_fable()
     print(fable)
 
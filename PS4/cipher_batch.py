@@ -0,0 +1,111 @@
+# PS 4: Caesar Cipher, batch coding with NumPy
+#
+# Encodes or decodes many messages at once. The messages are packed into a
+# two dimensional array of bytes, one row per message, and the shift tables from
+# cipher.py are stacked into a 27 x 256 array, so each group of rows with the same
+# shift is coded with a single NumPy lookup instead of one apply_shift call per
+# message. For a list of strings that is only coded once, apply_shift (a single
+# str.translate) is already as fast as packing them, so the packing is only worth
+# it when the messages are kept as an array.
+#
+# Usage: python cipher_batch.py [number of messages]
+
+import sys
+import time
+
+import numpy as np
+
+from cipher import SHIFT_TABLES, apply_shift
+
+# SHIFT_ARRAY[shift, byte] is the byte shifted by shift
+SHIFT_ARRAY = np.array([np.frombuffer(table, dtype=np.uint8) for table in SHIFT_TABLES])
+
+def to_array(messages):
+    """
+    Returns a tuple (array of bytes with one row per message, padded with
+    zeros to the longest message, array of message lengths).
+
+    messages: list of strings
+    """
+    lengths = np.array([len(message) for message in messages], dtype=np.intp)
+    width = lengths.max() if len(messages) > 0 else 0
+    data = np.zeros((len(messages), width), dtype=np.uint8)
+    data[np.arange(width) < lengths[:, np.newaxis]] = np.frombuffer(''.join(messages), dtype=np.uint8)
+    return data, lengths
+
+def from_array(data, lengths):
+    """
+    Returns the list of strings packed into data by to_array.
+
+    data: array of bytes, one row per message
+    lengths: array of message lengths
+    """
+    return [row[:length].tostring() for row, length in zip(data, lengths.tolist())]
+
+def encode_array(data, shifts):
+    """
+    Returns a new array of the messages in data, each Caesar shifted as
+    apply_shift would.
+
+    data: array of bytes, one row per message, as returned by to_array
+    shifts: int, the shift for every message, or a sequence of one shift per message
+
+    Example:
+    >>> data, lengths = to_array(['Hello, world!', 'This is a test.'])
+    >>> from_array(encode_array(data, [3, 8]), lengths)
+    ['Khoor,czruog!', 'Apq hq hiham a.']
+    """
+    shifts = np.mod(np.asarray(shifts, dtype=np.intp), 27)
+    if shifts.ndim == 0:
+        return SHIFT_ARRAY[shifts].take(data)
+    coded = np.empty_like(data)
+    for shift in np.unique(shifts).tolist():
+        rows = np.flatnonzero(shifts == shift)
+        coded[rows] = SHIFT_ARRAY[shift].take(data[rows])
+    return coded
+
+def decode_array(data, shifts):
+    """
+    Returns a new array of the messages in data, each decoded from the given
+    shift.
+
+    data: array of bytes, one row per message, as returned by to_array
+    shifts: int, or a sequence of one shift per message
+    """
+    return encode_array(data, np.negative(shifts))
+
+def all_shifts(text):
+    """
+    Returns a list of text shifted by each of 0 to 26, for trying every shift of
+    an encrypted text at once.
+
+    text: string
+
+    Example:
+    >>> all_shifts('Pmttw,hdwztl!')[-8]
+    'Hello, world!'
+    """
+    data = np.frombuffer(text, dtype=np.uint8)
+    return [row.tostring() for row in SHIFT_ARRAY[:, data]]
+
+if __name__ == '__main__':
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    f = open("fable.txt", "r")
+    words = f.read().split()
+    f.close()
+    messages = [' '.join(words[i % len(words):i % len(words) + 8]) for i in xrange(n)]
+    shifts = [i % 27 for i in xrange(n)]
+    data, lengths = to_array(messages)
+
+    start = time.time()
+    looped = [apply_shift(message, shift) for message, shift in zip(messages, shifts)]
+    loop_time = time.time() - start
+
+    start = time.time()
+    coded = encode_array(data, shifts)
+    array_time = time.time() - start
+
+    print "Messages:", n, "of up to", data.shape[1], "characters"
+    print "apply_shift per message: %.3f s" % loop_time
+    print "encode_array:            %.3f s" % array_time
+    print "Same results:", looped == from_array(coded, lengths)